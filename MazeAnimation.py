@@ -0,0 +1,226 @@
+import numpy as np
+import shutil
+import subprocess
+try:
+    from PIL import GifImagePlugin, Image # optional, compresses gif frames
+except ImportError:
+    Image = None
+
+# colours understood without matplotlib, as rgb bytes
+COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "green": (0, 128, 0),
+    "lime": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "orange": (255, 165, 0),
+    "purple": (128, 0, 128),
+    "gray": (128, 128, 128),
+    "grey": (128, 128, 128),
+}
+
+def toRGB(color):
+    # colour name, "#rrggbb" or (r, g, b) floats in [0, 1]
+    if isinstance(color, str):
+        if color.startswith("#") and len(color) == 7:
+            return tuple(int(color[i:i+2], 16) for i in (1, 3, 5))
+        if color.lower() in COLORS:
+            return COLORS[color.lower()]
+        raise ValueError("unknown colour %r, use a name of COLORS or #rrggbb" % color)
+    return tuple(int(round(255*x)) for x in color[:3])
+
+
+
+def extend(seen, indices):
+    # indices changed by an event, arrays are only kept by their bounds
+    if isinstance(indices, np.ndarray):
+        if indices.size != 0:
+            seen += (int(indices.min()), int(indices.max()))
+    elif isinstance(indices, (list, tuple)):
+        seen += indices
+    else:
+        seen.append(int(indices))
+
+
+
+class GifWriter:
+    def __init__(self, path, palette, height, width, fps):
+        self.file = open(path, "wb")
+        self.delay = max(2, int(round(100/fps))) # centiseconds, most viewers slow down anything shorter
+        self.transparent = len(palette) # extra palette index of the pixels left unchanged
+        self.bits = max(2, int(np.ceil(np.log2(len(palette)+1)))) # LZW minimum code size
+
+        table = np.zeros((2**self.bits, 3), dtype=np.uint8)
+        table[:len(palette)] = palette
+        self.file.write(b"GIF89a")
+        self.file.write(np.array([width, height], dtype="<u2").tobytes())
+        self.file.write(bytes([0xF0 | (self.bits-1), 0, 0]))
+        self.file.write(table.tobytes())
+        self.file.write(b"\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00") # loop forever
+
+
+
+    def __encode(self, pixels):
+        # LZW stream without compression: a clear code before the dictionary grows, so every code has the same width
+        clear, stop = 2**self.bits, 2**self.bits+1
+        group = 2**self.bits-2
+        pixels = pixels.ravel().astype(np.uint16)
+        full = len(pixels)//group*group
+        codes = np.concatenate((
+            np.insert(pixels[:full].reshape(-1, group), 0, clear, axis=1).ravel(),
+            [clear], pixels[full:], [stop])).astype(np.uint16)
+
+        width = self.bits+1
+        bits = (codes[:, None] >> np.arange(width, dtype=np.uint16)) & 1
+        data = np.packbits(bits.astype(np.uint8).ravel(), bitorder="little").tobytes()
+        # sub-blocks of at most 255 bytes
+        blocks = [bytes([len(data[i:i+255])]) + data[i:i+255] for i in range(0, len(data), 255)]
+        return bytes([self.bits]) + b"".join(blocks) + b"\x00"
+
+
+
+    def write(self, image, row, col, changed=None, delay=None):
+        # image of palette indices, drawn over the previous frames at pixel (row, col)
+        # only the changed pixels are drawn, the others are transparent and compress to almost nothing
+        delay = self.delay if delay is None else delay
+        height, width = image.shape
+        if changed is not None:
+            image = np.where(changed, image, self.transparent).astype(np.uint8)
+        self.file.write(b"\x21\xF9\x04\x05" + np.array([delay], dtype="<u2").tobytes() + bytes([self.transparent, 0]))
+        if Image is not None:
+            # image descriptor and compressed data of a grayscale image, whose values index the global palette
+            self.file.write(b"".join(GifImagePlugin.getdata(Image.fromarray(image, "L"), offset=(col, row))))
+            return
+        self.file.write(b"\x2C" + np.array([col, row, width, height], dtype="<u2").tobytes() + b"\x00")
+        self.file.write(self.__encode(image))
+
+
+
+    def hold(self, image, seconds):
+        # keep the last frame on screen, by redrawing 1 of its pixels
+        self.write(image[:1, :1], 0, 0, delay=int(round(100*seconds)))
+
+
+
+    def close(self):
+        self.file.write(b"\x3B")
+        self.file.close()
+
+
+
+class VideoWriter:
+    def __init__(self, path, palette, height, width, fps):
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("ffmpeg is required to write %s, install it or export a .gif instead" % path)
+        self.fps = fps
+        self.palette = np.array(palette, dtype=np.uint8)
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8) # latest frame, updated in place
+
+        # raw frames are piped to ffmpeg, which pads them to even sizes for yuv420p
+        self.process = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+             "-s", "%dx%d" % (width, height), "-r", str(fps), "-i", "-",
+             "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", path],
+            stdin=subprocess.PIPE)
+
+
+
+    def write(self, image, row, col, changed=None, count=1):
+        height, width = image.shape
+        self.frame[row:row+height, col:col+width] = self.palette[image]
+        for i in range(count):
+            self.process.stdin.write(memoryview(self.frame))
+
+
+
+    def hold(self, image, seconds):
+        self.write(image[:0, :0], 0, 0, count=int(round(self.fps*seconds)))
+
+
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError("ffmpeg failed with exit status %d" % self.process.returncode)
+
+
+
+class Animation:
+    def __init__(self, path, fps=30, every=1, scale=1, hold=1.0):
+        self.path = path   # .gif is written natively, anything else (e.g. .mp4) through ffmpeg
+        self.fps = fps     # frames per second of the output
+        self.every = every # number of step events per frame, the frames between are skipped
+        self.scale = scale # pixels per cell side
+        self.hold = hold   # seconds the final frame stays on screen
+
+        self.frames = 0 # number of frames written
+
+
+
+    def record(self, algorithm):
+        # any generator or solver that has not run yet
+        if hasattr(algorithm, "generateSteps"):
+            steps = algorithm.generateSteps()
+        else:
+            steps = algorithm.solveSteps()
+        return self.recordSteps(steps, algorithm.data, algorithm.colors)
+
+
+
+    def recordSteps(self, steps, data, colors):
+        # steps: [rows, cols, color] events, replayed onto a copy of data (the grid before the first step)
+        grid = np.asarray(data).astype(np.uint8)
+        shown = grid.copy() # grid of the latest frame written
+        palette = [toRGB(color) for color in colors]
+        height, width = grid.shape[0]*self.scale, grid.shape[1]*self.scale
+        writer = GifWriter if self.path.lower().endswith(".gif") else VideoWriter
+        writer = writer(self.path, palette, height, width, self.fps)
+
+        try:
+            self.frames = 0
+            self.__draw(writer, grid, shown, [0, grid.shape[0]-1, 0, grid.shape[1]-1], force=True)
+            rows, cols = [], [] # indices changed since the latest frame
+            count = 0
+            for eventRows, eventCols, color in steps:
+                grid[eventRows, eventCols] = color
+                extend(rows, eventRows)
+                extend(cols, eventCols)
+                count += 1
+                if count%self.every == 0 and len(rows) != 0:
+                    self.__draw(writer, grid, shown, [min(rows), max(rows), min(cols), max(cols)])
+                    rows, cols = [], []
+            if len(rows) != 0:
+                self.__draw(writer, grid, shown, [min(rows), max(rows), min(cols), max(cols)])
+            writer.hold(self.__scale(grid[:1, :1]), self.hold)
+        finally:
+            writer.close()
+        return self.frames
+
+
+
+    def __scale(self, image):
+        if self.scale == 1:
+            return image
+        return np.repeat(np.repeat(image, self.scale, axis=0), self.scale, axis=1)
+
+
+
+    def __draw(self, writer, grid, shown, dirty, force=False):
+        top, bottom, left, right = dirty
+        changed = grid[top:bottom+1, left:right+1] != shown[top:bottom+1, left:right+1]
+        # frames without any visible change are dropped
+        if not force:
+            rows, cols = np.flatnonzero(changed.any(axis=1)), np.flatnonzero(changed.any(axis=0))
+            if len(rows) == 0:
+                return
+            top, bottom, left, right = top+rows[0], top+rows[-1], left+cols[0], left+cols[-1]
+            changed = changed[rows[0]:rows[-1]+1, cols[0]:cols[-1]+1]
+
+        image = grid[top:bottom+1, left:right+1]
+        shown[top:bottom+1, left:right+1] = image
+        writer.write(self.__scale(image), top*self.scale, left*self.scale, None if force else self.__scale(changed))
+        self.frames += 1
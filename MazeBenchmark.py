@@ -0,0 +1,254 @@
+import argparse
+import csv
+import json
+import numpy as np
+import platform
+import sys
+import time
+import tracemalloc
+
+import MazeGenerator as gen
+import MazeSolver as sol
+
+# every algorithm to benchmark, with the options to run it with
+GENERATORS = {
+    "Wilson": lambda size, seed: gen.Wilson(size, seed=seed),
+    "Kruskal": lambda size, seed: gen.Kruskal(size, seed=seed),
+    "Prim": lambda size, seed: gen.Prim(size, seed=seed),
+    "Prim-weighted": lambda size, seed: gen.Prim(size, "weighted", seed=seed),
+    "DFS": lambda size, seed: gen.DFS(size, seed=seed),
+    "RecursiveDivision": lambda size, seed: gen.RecursiveDivision(size, seed=seed),
+    "AldousBroder": lambda size, seed: gen.AldousBroder(size, seed=seed),
+    "AldousBroder-hybrid": lambda size, seed: gen.AldousBroder(size, "hybrid", seed=seed),
+    "Eller": lambda size, seed: gen.Eller(size, seed=seed),
+}
+SOLVERS = {
+    "Dijkstra": lambda data: sol.Dijkstra(data),
+    "Astar-Manhattan": lambda data: sol.Astar(data, "Manhattan"),
+    "Astar-BackBFS": lambda data: sol.Astar(data, "BackBFS"),
+    "DeadEndFill-vectorized": lambda data: sol.DeadEndFill(data, "vectorized"),
+    "DeadEndFill-queue": lambda data: sol.DeadEndFill(data, "queue"),
+    "WallFollow-left": lambda data: sol.WallFollow(data, "left"),
+    "WallFollow-right": lambda data: sol.WallFollow(data, "right"),
+    "FloodFill": lambda data: sol.FloodFill(data),
+    "LPAstar": lambda data: sol.LPAstar(data),
+}
+KEYS = ["kind", "algorithm", "generator", "size"] # identify the same measurement across reports
+
+
+
+def measure(run, repeat, memory):
+    # best wall time of all repeats, and the peak traced memory of a separate run
+    seconds = float("inf")
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+
+def collectStats(algorithm):
+    # counters and timers of a separate run, with the stats of the algorithm enabled
+    algorithm.stats.enabled = True
+    if hasattr(algorithm, "generate"):
+        algorithm.generate()
+    else:
+        algorithm.solve()
+    return algorithm.stats.asDict()
+
+
+
+def record(kind, algorithm, generator, size, seconds, peak, stats=None):
+    # operations per cell are the counters of the stats run, e.g. walk steps or heap pushes, divided by the cells
+    opsPerCell = None if stats is None else {name: value/(size*size) for name, value in stats["counters"].items()}
+    return {
+        "kind": kind,
+        "algorithm": algorithm,
+        "generator": generator,
+        "size": size,
+        "seconds": seconds,
+        "peakBytes": peak,
+        "nsPerCell": seconds*1e9/(size*size),
+        "opsPerCell": opsPerCell,
+        "stats": stats,
+    }
+
+
+
+def benchmark(sizes, seed=0, generators=None, solvers=None, repeat=1, memory=True, log=None, stats=False):
+    generators = list(GENERATORS) if generators is None else generators
+    solvers = list(SOLVERS) if solvers is None else solvers
+    results = []
+
+    # warm up every algorithm on a tiny maze, so that the first measurement is not penalized
+    for generator in generators:
+        data = GENERATORS[generator](2, seed).generate()
+        for solver in solvers:
+            SOLVERS[solver](data.copy()).solve()
+
+    for size in sizes:
+        for generator in generators:
+            # the same seed gives the same maze to every solver
+            def generate():
+                return GENERATORS[generator](size, seed).generate()
+            data, seconds, peak = measure(generate, repeat, memory)
+            counters = collectStats(GENERATORS[generator](size, seed)) if stats else None
+            results.append(record("generator", generator, None, size, seconds, peak, counters))
+            if log is not None:
+                log(results[-1])
+
+            for solver in solvers:
+                def solve():
+                    return SOLVERS[solver](data.copy()).solve()
+                found, seconds, peak = measure(solve, repeat, memory)
+                counters = collectStats(SOLVERS[solver](data.copy())) if stats else None
+                results.append(record("solver", solver, generator, size, seconds, peak, counters))
+                if log is not None:
+                    log(results[-1])
+    return results
+
+
+
+def spanningTrees(size):
+    # number of spanning trees of a size x size grid of cells, i.e. of perfect mazes, by the matrix tree theorem
+    cells = size*size
+    laplacian = np.zeros((cells, cells))
+    for cell in range(cells):
+        row, col = divmod(cell, size)
+        for other in ([cell+1] if col < size-1 else []) + ([cell+size] if row < size-1 else []):
+            laplacian[cell, other] = laplacian[other, cell] = -1
+            laplacian[cell, cell] += 1
+            laplacian[other, other] += 1
+    return int(round(np.linalg.det(laplacian[1:, 1:])))
+
+
+
+def uniformity(generator, count, size=3, seed=0):
+    # chi-squared of the mazes of count seeds against a uniform draw among all perfect mazes,
+    # close to the degrees of freedom (trees - 1) for a uniform generator, and far above it for a biased one
+    counts = {}
+    for i in range(count):
+        maze = GENERATORS[generator](size, seed+i).generate().astype(np.uint8).tobytes()
+        counts[maze] = counts.get(maze, 0) + 1
+    trees = spanningTrees(size)
+    expected = count/trees
+    chiSquared = sum((n-expected)**2/expected for n in counts.values()) + (trees-len(counts))*expected
+    return {
+        "generator": generator,
+        "size": size,
+        "count": count,
+        "trees": trees,
+        "expected": expected,
+        "fewest": min(counts.values()) if len(counts) == trees else 0,
+        "most": max(counts.values()),
+        "chiSquared": chiSquared,
+        "degrees": trees-1,
+    }
+
+
+
+def compare(results, baseline, tolerance=0.1):
+    # all measurements slower than the baseline by more than the tolerance
+    previous = {tuple(item[key] for key in KEYS): item for item in baseline}
+    regressions = []
+    for item in results:
+        old = previous.get(tuple(item[key] for key in KEYS))
+        if old is None or old["seconds"] <= 0:
+            continue
+        ratio = item["seconds"]/old["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(dict(item, baselineSeconds=old["seconds"], ratio=ratio))
+    return regressions
+
+
+
+def writeReport(path, results, settings):
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0]))
+            writer.writeheader()
+            # stats and operations per cell are nested, so they are kept as json in their columns
+            nested = ["opsPerCell", "stats"]
+            writer.writerows([dict(item, **{key: None if item[key] is None else json.dumps(item[key]) for key in nested}) for item in results])
+    else:
+        report = dict(settings, python=platform.python_version(), numpy=np.__version__, results=results)
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+
+def readReport(path):
+    if path.endswith(".csv"):
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        for row in rows:
+            row["size"] = int(row["size"])
+            row["seconds"] = float(row["seconds"])
+            row["generator"] = row["generator"] or None
+            row["opsPerCell"] = json.loads(row["opsPerCell"]) if row.get("opsPerCell") else None
+            row["stats"] = json.loads(row["stats"]) if row.get("stats") else None
+        return rows
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+
+def printRecord(item):
+    name = item["algorithm"] if item["generator"] is None else item["generator"] + " > " + item["algorithm"]
+    peak = "" if item["peakBytes"] is None else "  %10.1f KiB" % (item["peakBytes"]/1024)
+    print("%-40s %6d  %10.4f s  %10.1f ns/cell%s" % (name, item["size"], item["seconds"], item["nsPerCell"], peak))
+    if item.get("stats") is not None:
+        counters = ["%s=%d (%.2f/cell)" % (name, value, item["opsPerCell"][name]) for name, value in item["stats"]["counters"].items()]
+        timers = ["%s=%.4fs" % pair for pair in item["stats"]["timers"].items()]
+        print("    " + "  ".join(counters + timers))
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark all maze generators and solvers headless")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 50, 100], help="maze sizes to sweep")
+    parser.add_argument("--seed", type=int, default=0, help="seed of every maze generated")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per measurement, the fastest one is kept")
+    parser.add_argument("--generators", nargs="+", choices=list(GENERATORS), help="generators to run, all by default")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), help="solvers to run, all by default")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory runs")
+    parser.add_argument("--stats", action="store_true", help="record the counters and timers of each algorithm, in a separate run")
+    parser.add_argument("--uniformity", type=int, metavar="COUNT", help="instead of timing, generate COUNT 3x3 mazes per generator and test them for uniformity")
+    parser.add_argument("--output", help="report to write, .json or .csv")
+    parser.add_argument("--compare", help="baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="slowdown ratio above 1 counted as a regression")
+    args = parser.parse_args(argv)
+
+    if args.uniformity is not None:
+        for generator in args.generators or list(GENERATORS):
+            item = uniformity(generator, args.uniformity, seed=args.seed)
+            print("%-40s %d trees  each seen %d-%d times, %.1f expected  chi2 = %.1f on %d degrees of freedom" % (
+                generator, item["trees"], item["fewest"], item["most"], item["expected"], item["chiSquared"], item["degrees"]))
+        return 0
+
+    results = benchmark(args.sizes, args.seed, args.generators, args.solvers, args.repeat, not args.no_memory, printRecord, args.stats)
+    if args.output is not None:
+        settings = {"sizes": args.sizes, "seed": args.seed, "repeat": args.repeat}
+        writeReport(args.output, results, settings)
+
+    if args.compare is not None:
+        regressions = compare(results, readReport(args.compare), args.tolerance)
+        for item in regressions:
+            print("regression: %s %s %d  %.4f s -> %.4f s (x%.2f)" % (
+                item["generator"] or "", item["algorithm"], item["size"], item["baselineSeconds"], item["seconds"], item["ratio"]))
+        if len(regressions) != 0:
+            return 1
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import numpy as np
+
+EAST = 1  # wall to the right of a cell
+SOUTH = 2 # wall below a cell
+
+class CompactMaze:
+    def __init__(self, walls):
+        self.walls = walls # 2 wall bits (east and south) of each cell, as uint8
+        self.height, self.width = walls.shape
+
+
+
+    def toData(self):
+        # the (2n+1)x(2n+1) grid used by MazeGenerator and MazeSolver
+        data = np.zeros((2*self.height+1, 2*self.width+1))
+        data[1::2, 1::2] = 1
+        data[1::2, 2::2] = (self.walls & EAST) == 0
+        data[2::2, 1::2] = (self.walls & SOUTH) == 0
+        return data
+
+
+
+    def pack(self):
+        # 4 cells per byte, row by row
+        walls = self.walls.ravel()
+        walls = np.concatenate((walls, np.zeros(-len(walls)%4, dtype=np.uint8))).reshape(-1, 4)
+        return walls[:, 0] | walls[:, 1] << 2 | walls[:, 2] << 4 | walls[:, 3] << 6
+
+
+
+    def breadthFirst(self, source, target=None):
+        # distances in cells from the source, -1 if unreached,
+        # and the flattened index of the predecessor of each reached cell, -1 if none
+        walls = self.walls.ravel()
+        width = self.width
+        visited = np.zeros(walls.size, dtype=bool)
+        distance = np.full(walls.size, -1, dtype=np.int32)
+        predecessor = np.full(walls.size, -1, dtype=np.int32)
+
+        cell = source[0]*width + source[1]
+        visited[cell] = True
+        distance[cell] = 0
+        if target is not None:
+            target = target[0]*width + target[1]
+
+        # expand the whole frontier at once, the outer walls are always set
+        frontier = np.array([cell])
+        depth = 0
+        while len(frontier) != 0 and (target is None or distance[target] < 0):
+            depth += 1
+            up = frontier[frontier >= width] - width
+            up = up[(walls[up] & SOUTH) == 0]
+            down = frontier[(walls[frontier] & SOUTH) == 0] + width
+            left = frontier[frontier%width != 0] - 1
+            left = left[(walls[left] & EAST) == 0]
+            right = frontier[(walls[frontier] & EAST) == 0] + 1
+
+            neighbours = np.concatenate((up, down, left, right))
+            parents = np.concatenate((up + width, down - width, left + 1, right - 1))
+            reached = ~visited[neighbours]
+            neighbours, parents = neighbours[reached], parents[reached]
+            # a cell reached from several parents keeps only one of them
+            predecessor[neighbours] = parents
+            frontier = neighbours[predecessor[neighbours] == parents]
+            visited[frontier] = True
+            distance[frontier] = depth
+
+        shape = self.walls.shape
+        return distance.reshape(shape), predecessor.reshape(shape)
+
+
+
+    def path(self, start=None, end=None):
+        # all cells from the start to the end, empty if unreachable
+        start = [0, 0] if start is None else start
+        end = [self.height-1, self.width-1] if end is None else end
+        distance, predecessor = self.breadthFirst(start, end)
+        if distance[end[0], end[1]] < 0:
+            return []
+
+        cells = []
+        cell = end[0]*self.width + end[1]
+        while cell >= 0:
+            cells.append(list(divmod(int(cell), self.width)))
+            cell = predecessor.flat[cell]
+        return cells[::-1]
+
+
+
+def toCompact(data):
+    # only the walls between cells are kept, every cell (odd row and column) must be a path and every corner a wall
+    if (data[1::2, 1::2] != 1).any() or (data[::2, ::2] != 0).any():
+        raise ValueError("only mazes whose cells are all paths (1) and whose corners are all walls (0) can be compacted")
+    walls = np.zeros((len(data)//2, len(data[0])//2), dtype=np.uint8)
+    walls |= np.where(data[1::2, 2::2] == 0, EAST, 0).astype(np.uint8)
+    walls |= np.where(data[2::2, 1::2] == 0, SOUTH, 0).astype(np.uint8)
+    return CompactMaze(walls)
+
+
+
+def unpack(packed, shape):
+    walls = np.stack((packed & 3, packed >> 2 & 3, packed >> 4 & 3, packed >> 6 & 3), axis=1).ravel()
+    return CompactMaze(walls[:shape[0]*shape[1]].reshape(shape).astype(np.uint8))
@@ -1,364 +1,1383 @@
-import matplotlib
-import matplotlib.pyplot as plt
+import array
+import heapq
+import itertools
 import numpy as np
-import random as rd
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from MazeStats import Stats
+
+class RandomStream:
+    def __init__(self, seed=None, bufferSize=4096):
+        self.generator = np.random.default_rng(seed) # seed can be an int, or a numpy.random.Generator
+        self.bufferSize = bufferSize
+        self.buffer = [] # random numbers drawn in bulk, used from the end
+
+
+
+    def random(self):
+        # a random float in [0, 1)
+        if len(self.buffer) == 0:
+            self.buffer = self.generator.random(self.bufferSize).tolist()
+        return self.buffer.pop()
+
+
+
+    def randint(self, n):
+        # a random int in [0, n)
+        if len(self.buffer) == 0:
+            self.buffer = self.generator.random(self.bufferSize).tolist()
+        return int(self.buffer.pop()*n)
+
+
 
 class Wilson:
-    def __init__(self, mazeSize, mode="fast-random", colors=["black", "white", "red"]):
+    def __init__(self, mazeSize, mode="fast-random", colors=["black", "white", "red"], observer=None, seed=None, stats=False):
         s = 2*mazeSize+1 
         self.mazeSize = s
         self.mode, self.order = mode.split("-")
         self.data = np.zeros((s, s))
 
-        self.space = []     # all posible cells
-        self.maze = []      # all visited cells
-        self.path = []      # path to be added to the solution 
+        self.space = []     # all cells not yet visited, in any order
+        self.position = []  # index of every cell in self.space
+        self.maze = None    # whether each cell is visited
+        self.walk = None    # direction in which the random walk last left each cell
+        self.path = []      # steps of the current random walk, only kept for plotting
+        self.cursor = 0     # first cell that may be unvisited, for sequential order
+        self.directions = [] # random directions drawn in bulk, used from the end
+
+        n = mazeSize
+        self.offsets = [-n, n, -1, 1]                      # up, down, left, right, between cell numbers
+        self.gridOffsets = [[-1, 0], [1, 0], [0, -1], [0, 1]] # up, down, left, right, on the grid
 
         self.colors = colors # >= 3, only first 3 will be used
                              # 1st: unvisited cells / walls
                              # 2nd: final paths
                              # 3rd: temporary paths
-        self.bounds = [colors.index(x) for x in colors]
-        self.figure = plt.figure()
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.random = RandomStream(seed) # same seed, same maze
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
 
 
 
     def __createPlot(self):
-        plt.ion()
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
 
-        cmap = matplotlib.colors.ListedColormap(self.colors)
-        norm = matplotlib.colors.BoundaryNorm(self.bounds, cmap.N-1)
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
 
-        axis = self.figure.add_subplot()
-        axis.set_xticks(ticks=[])
-        axis.set_yticks(ticks=[])
-        self.mazeImage = axis.imshow(self.data, cmap=cmap, norm=norm)
 
 
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
 
-    def __updatePlot(self, time=0.001):
-        self.mazeImage.set_data(self.data)
-        self.figure.canvas.draw()
-        plt.pause(time) # delay between plot updates
-        self.figure.canvas.flush_events()
+
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
 
 
 
     def __createStateSpace(self):
-        for i in range(len(self.data)):
-            for j in range(len(self.data)):
-                if i%2==1 and j%2==1: # all non-wall cells
-                    self.space.append([i, j])
+        n = self.mazeSize//2
+        self.space = list(range(n*n)) # cells are numbered row by row
+        self.position = list(range(n*n))
+        self.maze = np.zeros(n*n, dtype=bool)
+        self.walk = np.full(n*n, -1, dtype=np.int8)
+        self.cursor = 0
     
 
 
-    def __pickCell(self, color):
+    def __pickCell(self):
         if self.order == "sequential":
-            idx = 0
+            while self.maze[self.cursor]:
+                self.cursor += 1
+            return self.cursor
         if self.order == "random":
-            idx = rd.randint(0, len(self.space)-1) # a random cell
+            return self.space[self.random.randint(len(self.space))] # a random cell
 
-        cell = self.space.pop(idx)
-        self.data[cell[0]][cell[1]] = self.colors.index(color)
-        return cell
-    
 
-    
-    def __explore(self):
-        valid = False
-        while not valid:
-            direction = rd.randint(0, 3)
-            new = [[self.path[-1][0], self.path[-1][1]]]
-            for i in range(2):
-                if direction == 0: # up
-                    new.append([new[-1][0]-1, new[-1][1]])
-                if direction == 1: # down
-                    new.append([new[-1][0]+1, new[-1][1]])
-                if direction == 2: # left
-                    new.append([new[-1][0], new[-1][1]-1])
-                if direction == 3: # right
-                    new.append([new[-1][0], new[-1][1]+1])
 
-            # within boundaries
-            if new[-1][0] >= 0 and new[-1][1] >= 0 and new[-1][0] < self.mazeSize and new[-1][1] < self.mazeSize:
-                valid = True
+    def __removeCell(self, cell):
+        # move the last cell into the slot of the removed one
+        idx = self.position[cell]
+        last = self.space.pop()
+        if last != cell:
+            self.space[idx] = last
+            self.position[last] = idx
 
-        self.path += new
-        for cell in new:
-            self.data[cell[0]][cell[1]] = 2 #red
 
 
+    def __paint(self, cell, direction, color):
+        n = self.mazeSize//2
+        rows, cols = [2*(cell//n)+1], [2*(cell%n)+1]
+        if direction >= 0:
+            rows.append(rows[0]+self.gridOffsets[direction][0])
+            cols.append(cols[0]+self.gridOffsets[direction][1])
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
     
-    def __checkLoop(self):
-        firstOccur = self.path.index(self.path[-1]) + 1
-        if firstOccur != len(self.path):
-            self.path , loop= self.path[:firstOccur], self.path[firstOccur:-1] # separate loop from path
-            for cell in loop:
-                self.data[cell[0]][cell[1]] = 0 # black
-
 
     
-    def __addPath(self):
-        self.maze += self.path
-        for cell in self.path:
-            self.data[cell[0]][cell[1]] = 1 # white
-            if cell in self.space:
-                self.space.remove(cell)
-
+    def __explore(self, cell):
+        n = self.mazeSize//2
+        valid = False
+        while not valid:
+            if len(self.directions) == 0:
+                self.directions = self.random.generator.integers(0, 4, self.random.bufferSize).tolist()
+            direction = self.directions.pop()
+            # within boundaries
+            if direction == 0: # up
+                valid = cell >= n
+            elif direction == 1: # down
+                valid = cell < n*(n-1)
+            elif direction == 2: # left
+                valid = cell%n != 0
+            else: # right
+                valid = cell%n != n-1
+
+        # only the latest exit is kept, which erases any loop formed by the walk
+        self.walk[cell] = direction
+        next = cell + self.offsets[direction]
+
+        if self.mode == "detailed" and self.tracing:
+            self.path.append([cell, direction])
+            self.__paint(cell, direction, 2) # red
+            if not self.maze[next]:
+                self.__paint(next, -1, 2)
+        return next
 
 
-    def generate(self):
+    
+    def __addPath(self, start):
+        # erase the walk, including loops, from the plot
+        for cell, direction in self.path:
+            self.__paint(cell, direction, 0) # black
+        self.path = []
+
+        # follow the last exits from the start of the walk until it reaches the maze
+        cell = start
+        while not self.maze[cell]:
+            self.maze[cell] = True
+            self.__removeCell(cell)
+            direction = int(self.walk[cell])
+            if self.tracing:
+                self.__paint(cell, direction, 1) # white
+            cell += self.offsets[direction]
+
+
+
+    def __displayMaze(self):
+        # every cell but the first one is connected in its last exit direction
+        n = self.mazeSize//2
+        rows, cols = np.divmod(np.arange(n*n), n)
+        self.data[2*rows+1, 2*cols+1] = 1
+        connected = self.walk >= 0
+        gridOffsets = np.array(self.gridOffsets)[self.walk[connected]]
+        self.data[2*rows[connected]+1+gridOffsets[:, 0], 2*cols[connected]+1+gridOffsets[:, 1]] = 1
+
+
+
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
         self.__createPlot() 
         self.__createStateSpace() 
 
-        self.maze.append(self.__pickCell(self.colors[1])) # white
+        first = self.__pickCell()
+        self.maze[first] = True
+        self.__removeCell(first)
+        self.__paint(first, -1, 1) # white
+        if self.tracing:
+            yield from self.__flush()
 
         # until all cells in state space are visited
+        self.stats.start("walk")
+        walks, steps = 0, 0
         while len(self.space) != 0:
             # pick another cell to start a path
-            self.path = [self.__pickCell(self.colors[2])] # red
+            start = self.__pickCell()
+            walks += 1
+            if self.tracing:
+                self.__paint(start, -1, 2) # red
             # extends the path until it intersects with any cells that are included in the maze
-            while self.path[-1] not in self.maze:
+            cell = start
+            while not self.maze[cell]:
                 # extends the path by selecting a random direction
-                self.__explore()
-                # if the path intersects with itself (forms a loop), erase the loop
-                self.__checkLoop()
+                cell = self.__explore(cell)
+                steps += 1
+                if self.mode == "detailed" and self.tracing:
+                    yield from self.__flush()
+
+            # add the loop-erased path to the maze
+            self.__addPath(start)
+            if self.tracing:
+                yield from self.__flush()
+        self.stats.stop("walk")
+        # every step of a walk is either kept as a path, or erased with a loop
+        self.stats.count("walks", walks)
+        self.stats.count("walkSteps", steps)
+        self.stats.count("erasedSteps", steps - (len(self.maze)-1))
+        
+        # every change is already painted when tracing
+        if not self.tracing:
+            self.__displayMaze()
+        self.__updatePlot()
+        self.stats.stop("total")
+        self.__closePlot("end of wilson's algorithm")
+
 
-                if self.mode == "detailed":
-                    self.__updatePlot()
 
-            # add the entire valid path to the maze
-            self.__addPath()
+    def generate(self):
+        for event in self.__run():
+            pass
+        return self.data
+
+
+
+    def generateSteps(self):
+        # yields [rows, cols, color] for every change of self.data, starting from an empty grid
+        self.tracing = True
+        yield from self.__run()
+
+
+
+class AldousBroder:
+    def __init__(self, mazeSize, mode="plain", fraction=0.3, colors=["black", "white", "red"], observer=None, seed=None, stats=False):
+        s = 2*mazeSize+1 
+        self.mazeSize = s
+        self.mode = mode         # "plain": random walk only, "hybrid": loop-erased walks (Wilson) once fraction of cells are visited
+        self.fraction = fraction # part of the cells visited by the random walk in hybrid mode
+                                 # the loop-erased walks ignore where the random walk stopped, so hybrid mazes are biased, not uniform:
+                                 # on 60000 3x3 mazes, each of the 192 should appear about 312 times, but appear 240-391 times with
+                                 # fraction=0.3 and 189-445 times with fraction=0.5 (MazeBenchmark.py --uniformity), 268-353 in plain mode
+        self.data = np.zeros((s, s))
+
+        self.state = None # 0 for unvisited cells, 1 for visited ones and 2 for the border, on cells padded by a ring
+        self.link = None  # direction from each visited cell to its parent, 255 if none
+        self.walk = None  # direction in which the loop-erased walk last left each cell
+
+        w = mazeSize+2
+        self.offsets = [-w, w, -1, 1]                      # up, down, left, right, between padded cell numbers
+        self.gridOffsets = [[-1, 0], [1, 0], [0, -1], [0, 1]] # up, down, left, right, on the grid
+
+        self.colors = colors # >= 3, only first 3 will be used
+                             # 1st: unvisited cells / walls
+                             # 2nd: final paths
+                             # 3rd: start of the current loop-erased walk
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.random = RandomStream(seed) # same seed, same maze
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
+
+
+
+    def __createPlot(self):
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
+
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
+
+
+
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
+
+
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
             self.__updatePlot()
-        
+        return events
+
+
+
+    def __createStateSpace(self):
+        w = self.mazeSize//2+2
+        state = np.full((w, w), 2, dtype=np.uint8)
+        state[1:-1, 1:-1] = 0
+        self.state = bytearray(state.tobytes())
+        self.link = bytearray(b"\xff")*(w*w)
+        self.walk = bytearray(w*w)
+
+
+
+    def __paint(self, cell, direction, color):
+        w = self.mazeSize//2+2
+        rows, cols = [2*(cell//w)-1], [2*(cell%w)-1]
+        if direction >= 0:
+            rows.append(rows[0]+self.gridOffsets[direction][0])
+            cols.append(cols[0]+self.gridOffsets[direction][1])
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
+
+
+
+    def __directions(self):
+        # random directions drawn in bulk, endless
+        while True:
+            yield from self.random.generator.integers(0, 4, self.random.bufferSize).tolist()
+
+
+
+    def __randomWalk(self, cell, count, directions):
+        # every cell entered for the first time is connected to the cell the walk came from, until count cells are
+        state, link, offsets, tracing = self.state, self.link, self.offsets, self.tracing
+        steps = 0
+        for direction in directions:
+            if count <= 0:
+                break
+            next = cell + offsets[direction]
+            if state[next] == 2:
+                continue
+            steps += 1
+            if state[next] == 0:
+                state[next] = 1
+                link[next] = direction^1
+                count -= 1
+                if tracing:
+                    self.__paint(next, direction^1, 1) # white
+                    yield from self.__flush()
+            cell = next
+        self.stats.count("randomWalkSteps", steps)
+
+
+
+    def __loopErasedWalks(self, directions):
+        # Wilson's algorithm for the remaining cells, in any order
+        state, link, walk, offsets, tracing = self.state, self.link, self.walk, self.offsets, self.tracing
+        walks, steps = 0, 0
+        for start in np.flatnonzero(np.frombuffer(self.state, dtype=np.uint8) == 0).tolist():
+            if state[start] != 0:
+                continue
+            walks += 1
+            # only the latest exit of each cell is kept, which erases the loops
+            if tracing:
+                self.__paint(start, -1, 2) # red
+            cell = start
+            for direction in directions:
+                next = cell + offsets[direction]
+                if state[next] == 2:
+                    continue
+                walk[cell] = direction
+                cell = next
+                steps += 1
+                if state[cell] == 1:
+                    break
+
+            # follow the last exits from the start until the maze
+            cell = start
+            while state[cell] == 0:
+                state[cell] = 1
+                link[cell] = walk[cell]
+                if tracing:
+                    self.__paint(cell, walk[cell], 1) # white
+                cell += offsets[walk[cell]]
+            if tracing:
+                yield from self.__flush()
+        self.stats.count("loopErasedWalks", walks)
+        self.stats.count("loopErasedSteps", steps)
+
+
+
+    def __displayMaze(self):
+        # every cell but the initial one is connected to its parent
+        n = self.mazeSize//2
+        link = np.frombuffer(self.link, dtype=np.uint8).reshape(n+2, n+2)[1:-1, 1:-1].ravel()
+        rows, cols = np.divmod(np.arange(n*n), n)
+        self.data[2*rows+1, 2*cols+1] = 1
+        connected = link != 255
+        gridOffsets = np.array(self.gridOffsets)[link[connected]]
+        self.data[2*rows[connected]+1+gridOffsets[:, 0], 2*cols[connected]+1+gridOffsets[:, 1]] = 1
+
+
+
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
+        self.__createPlot()
+        self.__createStateSpace()
+        directions = self.__directions()
+
+        # pick a cell as the initial cell to be included in the maze
+        n = self.mazeSize//2
+        start = self.random.randint(n*n)
+        start = (start//n+1)*(n+2) + start%n+1
+        self.state[start] = 1
+        self.__paint(start, -1, 1) # white
+        if self.tracing:
+            yield from self.__flush()
+
+        # the random walk is fast while most cells are new, the loop-erased walks once most cells are in the maze
+        count = n*n-1
+        if self.mode == "hybrid":
+            count = min(count, int(self.fraction*n*n))
+        self.stats.start("randomWalk")
+        yield from self.__randomWalk(start, count, directions)
+        self.stats.stop("randomWalk")
+        self.stats.start("loopErasedWalk")
+        yield from self.__loopErasedWalks(directions)
+        self.stats.stop("loopErasedWalk")
+
+        # every change is already painted when tracing
+        if not self.tracing:
+            self.__displayMaze()
         self.__updatePlot()
-        print("end of wilson's algorithm") 
-        plt.ioff()
-        plt.show()
+        self.stats.stop("total")
+        self.__closePlot("end of aldous-broder algorithm")
+
+
+
+    def generate(self):
+        for event in self.__run():
+            pass
         return self.data
 
 
 
+    def generateSteps(self):
+        # yields [rows, cols, color] for every change of self.data, starting from an empty grid
+        self.tracing = True
+        yield from self.__run()
+
+
+
 class Kruskal:
-    def __init__(self, mazeSize, colors=["black", "white", "red"]):
+    def __init__(self, mazeSize, colors=["black", "white", "red"], observer=None, seed=None, stats=False):
         s = 2*mazeSize+1
         self.mazeSize = s
         self.data = np.zeros((s, s))
 
-        self.space = []   # all possible cells
-        self.maze = []    # all visited cells
-        self.current = [] # 2 "adjacent" cells with a wall between
+        self.parent = []  # disjoint-set forest of all cells, indexed by cell number
+        self.rank = []    # upper bound of the height of each tree in the forest
+        self.walls = []   # 2 "adjacent" cells with a wall between, for all walls in random order
 
         self.colors = colors # >= 3, only first 3 will be used
                              # 1st: unvisited cells / walls
                              # 2nd: final paths
                              # 3rd: temporary paths
-        self.bounds = [colors.index(x) for x in colors]
-        self.figure = plt.figure()
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.random = RandomStream(seed) # same seed, same maze
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
 
 
 
     def __createPlot(self):
-        plt.ion()
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
 
-        cmap = matplotlib.colors.ListedColormap(self.colors)
-        norm = matplotlib.colors.BoundaryNorm(self.bounds, cmap.N-1)
 
-        axis = self.figure.add_subplot()
-        axis.set_xticks(ticks=[])
-        axis.set_yticks(ticks=[])
-        self.mazeImage = axis.imshow(self.data, cmap=cmap, norm=norm)
+    
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
+
+
+
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
 
 
-    
-    def __updatePlot(self, time=0.001):
-        self.mazeImage.set_data(self.data)
-        self.figure.canvas.draw()
-        plt.pause(time) # delay between plot updates
-        self.figure.canvas.flush_events()
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
 
 
 
     def __createStateSpace(self):
-        for i in range(len(self.data)):
-            for j in range(len(self.data)):
-                if i%2==1 and j%2==1:
-                    self.space.append([[i, j]])
+        n = self.mazeSize//2
+        self.parent = list(range(n*n))
+        self.rank = [0]*(n*n)
 
+        # every cell is numbered row by row, and has a wall to its right and below
+        cells = np.arange(n*n).reshape(n, n)
+        first = np.concatenate((cells[:, :-1].ravel(), cells[:-1, :].ravel()))
+        second = np.concatenate((cells[:, 1:].ravel(), cells[1:, :].ravel()))
+        order = self.random.generator.permutation(len(first)) # each wall is tested once only
+        self.walls = [first[order], second[order]]
 
 
-    def __explore(self):
-        valid = False
-        while not valid:
-            group = self.space[rd.randint(0, len(self.space)-1)]
-            cell = group[rd.randint(0, len(group)-1)]
-            self.current = [cell]
-            dir = rd.randint(0, 3)
-            for i in range(2):
-                if dir == 0: # up
-                    self.current.append([self.current[-1][0]-1, self.current[-1][1]])
-                if dir == 1: # down
-                    self.current.append([self.current[-1][0]+1, self.current[-1][1]])
-                if dir == 2: # left
-                    self.current.append([self.current[-1][0], self.current[-1][1]-1])
-                if dir == 3: # right
-                    self.current.append([self.current[-1][0], self.current[-1][1]+1])
-
-            if self.current[-1][0] >= 0 and self.current[-1][1] >= 0 and self.current[-1][0] < self.mazeSize and self.current[-1][1] < self.mazeSize:
-                valid = True
-
-
-
-    def __compare(self):
-        color = self.data[self.current[1][0]][self.current[1][1]]
-        self.data[self.current[1][0]][self.current[1][1]] = 2
-        self.__updatePlot() 
-        self.data[self.current[1][0]][self.current[1][1]] = color
-
-        for group in self.space:
-            for cell in group:
-                if cell == self.current[0]:
-                    gp1 = self.space.index(group)
-                if cell == self.current[-1]:
-                    gp2 = self.space.index(group)
-        # break the wall between if the two cells are not from the same group
-        if gp1 != gp2:
-            self.space[gp1] += self.space[gp2]
-            self.space.pop(gp2)
-            for cell in self.current:
-                self.data[cell[0]][cell[1]] = 1
 
+    def __find(self, cell):
+        root = cell
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # path compression
+        while self.parent[cell] != root:
+            self.parent[cell], cell = root, self.parent[cell]
+        return root
 
 
-    def generate(self):
+
+    def __compare(self, cell1, cell2):
+        root1 = self.__find(cell1)
+        root2 = self.__find(cell2)
+        if root1 == root2:
+            return False
+
+        # union by rank
+        if self.rank[root1] < self.rank[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        if self.rank[root1] == self.rank[root2]:
+            self.rank[root1] += 1
+        return True
+
+
+
+    def __highlight(self, cell1, cell2, color):
+        n = self.mazeSize//2
+        wall = [cell1//n + cell2//n + 1, cell1%n + cell2%n + 1]
+        previous = self.data[wall[0], wall[1]]
+        self.data[wall[0], wall[1]] = color
+        self.events.append([[wall[0]], [wall[1]], color])
+        return previous
+
+
+
+    def __breakWalls(self, cells1, cells2, color):
+        n = self.mazeSize//2
+        rows1, cols1 = divmod(cells1, n)
+        rows2, cols2 = divmod(cells2, n)
+        self.data[2*rows1+1, 2*cols1+1] = color
+        self.data[2*rows2+1, 2*cols2+1] = color
+        self.data[rows1+rows2+1, cols1+cols2+1] = color
+        if self.tracing:
+            self.events.append([[2*rows1+1, rows1+rows2+1, 2*rows2+1], [2*cols1+1, cols1+cols2+1, 2*cols2+1], color])
+
+
+
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
         self.__createPlot()
+        self.stats.start("shuffle")
         self.__createStateSpace()
+        self.stats.stop("shuffle")
 
+        first, second = self.walls
+        broken = np.zeros(len(first), dtype=bool)
+        groups = len(self.parent)
+        tested = 0
         # until all cells in state space form one and only one group
-        while len(self.space) != 1:
-            # selects two cells with a wall in between
-            self.__explore()
+        self.stats.start("unions")
+        for idx, (cell1, cell2) in enumerate(zip(first.tolist(), second.tolist())):
+            if groups == 1:
+                break
+            tested += 1
+            if self.tracing:
+                # highlight the wall being compared
+                color = self.__highlight(cell1, cell2, 2)
+                yield from self.__flush()
+                self.__highlight(cell1, cell2, color)
             # compare whether the two cells on either side of the wall belong to the same group
-            self.__compare()
+            if self.__compare(cell1, cell2):
+                broken[idx] = True
+                groups -= 1
+                if self.tracing:
+                    self.__breakWalls(cell1, cell2, 1)
+        self.stats.stop("unions")
+        # walls between cells of the same group are rejected
+        self.stats.count("wallsTested", tested)
+        self.stats.count("wallsBroken", len(self.parent)-groups)
+        self.stats.count("wallsRejected", tested - (len(self.parent)-groups))
+
+        # break the walls between the cells that were from different groups
+        if self.tracing:
+            yield from self.__flush()
+        else:
+            self.__breakWalls(first[broken], second[broken], 1)
+
+        self.__updatePlot()
+        self.stats.stop("total")
+        self.__closePlot("end of kruskal algorithm")
+
 
-        print("end of kruskal algorithm")   
-        plt.ioff()
-        plt.show()
+
+    def generate(self):
+        for event in self.__run():
+            pass
         return self.data
 
 
 
+    def generateSteps(self):
+        # yields [rows, cols, color] for every change of self.data, starting from an empty grid
+        self.tracing = True
+        yield from self.__run()
+
+
+
 class Prim:
-    def __init__(self, mazeSize, colors=["black", "white", "red"]):
+    def __init__(self, mazeSize, mode="random", colors=["black", "white", "red"], observer=None, seed=None, stats=False):
         s = 2*mazeSize+1 
         self.mazeSize = s
+        self.mode = mode # "random": uniform pick of an adjacent cell, "weighted": random edge weights (true Prim)
         self.data = np.zeros((s, s))
 
-        self.space = []    # all possible cells 
-        self.maze = []     # all visited cells
-        self.adjacent = [] # all adjacent cells or visited cells, and their parant correspondingly
+        self.maze = None     # whether each cell is visited
+        self.link = None     # direction from each visited cell to its parent
+        self.adjacent = []   # all adjacent cells of visited cells, in any order
+        self.position = None # index of each cell in self.adjacent, -1 if not adjacent
+        self.edges = []      # heap of [weight, adjacent cell, direction to its parent], for weighted mode
+
+        n = mazeSize
+        self.offsets = [-n, n, -1, 1]                      # up, down, left, right, between cell numbers
+        self.gridOffsets = [[-1, 0], [1, 0], [0, -1], [0, 1]] # up, down, left, right, on the grid
 
         self.colors = colors # >= 3, only first 3 will be used
                              # 1st: unvisited cells / walls
                              # 2nd: final paths
                              # 3rd: adjacent cells
-        self.bounds = [colors.index(x) for x in colors]
-        self.figure = plt.figure()
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.random = RandomStream(seed) # same seed, same maze
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
 
 
 
     def __createPlot(self):
-        plt.ion()
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
 
-        cmap = matplotlib.colors.ListedColormap(self.colors)
-        norm = matplotlib.colors.BoundaryNorm(self.bounds, cmap.N-1)
 
-        axis = self.figure.add_subplot()
-        axis.set_xticks(ticks=[])
-        axis.set_yticks(ticks=[])
-        self.mazeImage = axis.imshow(self.data, cmap=cmap, norm=norm)
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
 
 
 
-    def __updatePlot(self, time=0.001):
-        self.mazeImage.set_data(self.data)
-        self.figure.canvas.draw()
-        plt.pause(time) # delay between plot updates
-        self.figure.canvas.flush_events()
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
+
+
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
 
 
 
     def __createStateSpace(self):
-        for i in range(len(self.data)):
-            for j in range(len(self.data)):
-                if i%2==1 and j%2==1:
-                    self.space.append([i, j])
+        n = self.mazeSize//2
+        self.maze = np.zeros(n*n, dtype=bool) # cells are numbered row by row
+        self.link = np.full(n*n, -1, dtype=np.int8)
+        self.adjacent = []
+        self.position = [-1]*(n*n)
+        self.edges = []
+
+
+
+    def __paint(self, cell, direction, color):
+        n = self.mazeSize//2
+        rows, cols = [2*(cell//n)+1], [2*(cell%n)+1]
+        if direction >= 0:
+            rows.append(rows[0]+self.gridOffsets[direction][0])
+            cols.append(cols[0]+self.gridOffsets[direction][1])
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
+
+
+
+    def __neighbours(self, cell):
+        n = self.mazeSize//2
+        row, col = divmod(cell, n)
+        neighbours = []
+        if row > 0:
+            neighbours.append([0, cell-n]) # up
+        if row < n-1:
+            neighbours.append([1, cell+n]) # down
+        if col > 0:
+            neighbours.append([2, cell-1]) # left
+        if col < n-1:
+            neighbours.append([3, cell+1]) # right
+        return neighbours
+
+
+
+    def __addNeighbours(self, parent):
+        for direction, neighbour in self.__neighbours(parent):
+            if self.maze[neighbour]:
+                continue
+            if self.mode == "weighted":
+                # the direction back to the parent is the opposite one
+                heapq.heappush(self.edges, [self.random.random(), neighbour, direction^1])
+            elif self.position[neighbour] < 0:
+                self.position[neighbour] = len(self.adjacent)
+                self.adjacent.append(neighbour)
+            if self.tracing:
+                self.__paint(neighbour, -1, 2) # red
 
 
 
-    def __pickInitial(self, color):
-        idx = rd.randint(0, len(self.space)-1)
-        cell = self.space.pop(idx)
-        self.data[cell[0]][cell[1]] = self.colors.index(color)
-        return cell
+    def __connect(self):
+        if self.mode == "weighted":
+            # the lightest edge to a cell not yet visited
+            next = -1
+            while next < 0 or self.maze[next]:
+                weight, next, direction = heapq.heappop(self.edges)
+        else:
+            # a random adjacent cell, removed by moving the last adjacent cell into its slot
+            idx = self.random.randint(len(self.adjacent))
+            next = self.adjacent[idx]
+            last = self.adjacent.pop()
+            if last != next:
+                self.adjacent[idx] = last
+                self.position[last] = idx
+            self.position[next] = -1
+
+            # connect to a random visited neighbour
+            parents = [direction for direction, neighbour in self.__neighbours(next) if self.maze[neighbour]]
+            direction = parents[self.random.randint(len(parents))]
+
+        self.maze[next] = True
+        self.link[next] = direction
+        if self.tracing:
+            self.__paint(next, direction, 1) # white
+        return next
+
+
+
+    def __displayMaze(self):
+        # every cell but the initial one is connected to its parent
+        n = self.mazeSize//2
+        rows, cols = np.divmod(np.arange(n*n), n)
+        self.data[2*rows+1, 2*cols+1] = 1
+        connected = self.link >= 0
+        gridOffsets = np.array(self.gridOffsets)[self.link[connected]]
+        self.data[2*rows[connected]+1+gridOffsets[:, 0], 2*cols[connected]+1+gridOffsets[:, 1]] = 1
     
 
 
-    def __addNeighbours(self):
-        parent = self.maze[-1]
-        neighbours = [[parent[0]-2, parent[1]], [parent[0]+2, parent[1]], [parent[0], parent[1]-2], [parent[0], parent[1]+2]]
-        for neighbour in neighbours:
-            if neighbour not in self.maze and neighbour[0] >= 0 and neighbour[1] >= 0 and neighbour[0] < self.mazeSize and neighbour[1] < self.mazeSize:
-                self.adjacent.append([neighbour, parent])
-                self.data[neighbour[0]][neighbour[1]] = 2 #red
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
+        self.__createPlot()
+        self.__createStateSpace()
 
+        # pick a cell as the initial cell to be included in the maze
+        n = self.mazeSize//2
+        next = self.random.randint(n*n)
+        self.maze[next] = True
+        self.__paint(next, -1, 1) # white
+        if self.tracing:
+            yield from self.__flush()
 
+        # until all cells in state space are visited 
+        counting = self.stats.enabled
+        peak = 0 # largest number of adjacent cells (or edges in weighted mode)
+        for i in range(n*n-1):
+            # store all neighbour cells of the latest cell added to the maze
+            self.__addNeighbours(next)
+            if counting:
+                peak = max(peak, len(self.edges) if self.mode == "weighted" else len(self.adjacent))
+            # extends the maze by selecting a neighbour cell
+            next = self.__connect()
+            if self.tracing:
+                yield from self.__flush()
+        self.stats.peak("peakFrontier", peak)
+
+        # every change is already painted when tracing
+        if not self.tracing:
+            self.__displayMaze()
+        self.__updatePlot()
+        self.stats.stop("total")
+        self.__closePlot("end of prim algorithm")
 
-    def __connect(self):
-        idx = rd.randint(0, len(self.adjacent)-1)
-        next, parent = self.adjacent.pop(idx)
-        # remove all of the same neighbour cell but with other parents
-        newAdj = []
-        for item in self.adjacent:
-            if item[0] != next:
-                newAdj.append(item)
-        self.adjacent = newAdj
 
-        self.data[next[0]][next[1]] = 1
-        # add the wall to the path
-        wall = self.__findMiddle(next, parent)
-        self.data[wall[0]][wall[1]] = 1
 
-        self.maze.append(next)
-        self.space.remove(next)
+    def generate(self):
+        for event in self.__run():
+            pass
+        return self.data
 
 
 
-    def __findMiddle(self, cell1, cell2):
-        midX = int(abs(cell1[0] + cell2[0]) /2)
-        midY = int(abs(cell1[1] + cell2[1]) /2)
-        return [midX, midY] 
-    
+    def generateSteps(self):
+        # yields [rows, cols, color] for every change of self.data, starting from an empty grid
+        self.tracing = True
+        yield from self.__run()
+
+
+
+class DFS:
+    def __init__(self, mazeSize, colors=["black", "white", "red"], observer=None, seed=None, stats=False):
+        s = 2*mazeSize+1 
+        self.mazeSize = s
+        self.data = np.zeros((s, s))
+
+        self.grid = None  # maze with an extra ring of visited border, flattened, 1 for visited cells and broken walls
+        self.stack = None # cells of the current path, array-backed, used up to its top
+
+        w = s+2
+        self.gridOffsets = [-2*w, 2*w, -2, 2] # up, down, left, right, between neighbour cells on the padded grid
+        self.orders = [list(order) for order in itertools.permutations(self.gridOffsets)] # all 24 orders to try directions
+
+        self.colors = colors # >= 3, only first 3 will be used
+                             # 1st: unvisited cells / walls
+                             # 2nd: final paths
+                             # 3rd: cells on the current path
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.random = RandomStream(seed) # same seed, same maze
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
+
+
+
+    def __createPlot(self):
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
+
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
+
+
+
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
+
+
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
+
+
+
+    def __createStateSpace(self):
+        n = self.mazeSize//2
+        w = self.mazeSize+2
+        grid = np.zeros((w, w), dtype=np.uint8)
+        grid[[0, -1], :] = 1 # the border ring stops the search without any bounds check
+        grid[:, [0, -1]] = 1
+        self.grid = bytearray(grid.tobytes())
+        self.stack = array.array("q", bytes(8*n*n))
+
+
+
+    def __paint(self, positions, color):
+        # positions on the padded grid
+        w = self.mazeSize+2
+        rows, cols = [position//w-1 for position in positions], [position%w-1 for position in positions]
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
+
+
+
+    def __displayMaze(self):
+        w = self.mazeSize+2
+        self.data[:] = np.frombuffer(self.grid, dtype=np.uint8).reshape(w, w)[1:-1, 1:-1]
+
+
+
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
+        self.__createPlot()
+        self.__createStateSpace()
+        grid, stack, orders, tracing = self.grid, self.stack, self.orders, self.tracing
+
+        # pick a cell as the initial cell of the path
+        n = self.mazeSize//2
+        w = self.mazeSize+2
+        cell = self.random.randint(n*n)
+        cell = (2*(cell//n)+2)*w + 2*(cell%n)+2
+        grid[cell] = 1
+        stack[0] = cell
+        top = 0
+        peak = 0 # longest path, always reached at a dead end
+        if tracing:
+            self.__paint([cell], 2) # red
+            yield from self.__flush()
+
+        # until the path is back past the initial cell
+        while top >= 0:
+            # random orders drawn in bulk
+            for pick in self.random.generator.integers(0, 24, self.random.bufferSize).tolist():
+                # the first unvisited neighbour in a random order is a uniform pick
+                for offset in orders[pick]:
+                    next = cell+offset
+                    if not grid[next]:
+                        break
+                else:
+                    # dead end, back to the previous cell of the path
+                    if top > peak:
+                        peak = top
+                    top -= 1
+                    if tracing:
+                        self.__paint([cell] if top < 0 else [cell, (cell+stack[top])//2], 1) # white
+                        yield from self.__flush()
+                    if top < 0:
+                        break
+                    cell = stack[top]
+                    continue
+
+                # break the wall and extend the path
+                grid[(cell+next)//2] = 1
+                grid[next] = 1
+                top += 1
+                stack[top] = next
+                cell = next
+                if tracing:
+                    self.__paint([(cell+stack[top-1])//2, cell], 2) # red
+                    yield from self.__flush()
+
+        self.stats.peak("peakStack", peak+1)
+
+        # every change is already painted when tracing
+        if not tracing:
+            self.__displayMaze()
+        self.__updatePlot()
+        self.stats.stop("total")
+        self.__closePlot("end of depth-first search algorithm")
+
 
 
     def generate(self):
+        for event in self.__run():
+            pass
+        return self.data
+
+
+
+    def generateSteps(self):
+        # yields [rows, cols, color] for every change of self.data, starting from an empty grid
+        self.tracing = True
+        yield from self.__run()
+
+
+
+class RecursiveDivision:
+    def __init__(self, mazeSize, colors=["black", "white", "red"], observer=None, seed=None, workers=None, stats=False):
+        s = 2*mazeSize+1 
+        self.mazeSize = s
+        self.data = np.zeros((s, s))
+        self.workers = workers # processes sharing the smaller chambers, None or 1 runs in this process only
+
+        self.chambers = None # chambers still to divide, as rows of cell bounds [top, bottom, left, right), 1 column each
+
+        self.colors = colors # >= 3, only first 3 will be used
+                             # 1st: walls
+                             # 2nd: paths
+                             # 3rd: walls just drawn
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.random = RandomStream(seed) # same seed, same maze (for the same number of workers)
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
+
+
+
+    def __createPlot(self):
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
+
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
+
+
+
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
+
+
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
+
+
+
+    def __createStateSpace(self):
+        # an open interior, split by walls from then on
+        n = self.mazeSize//2
+        if self.tracing:
+            self.__paint(*np.indices((2*n-1, 2*n-1)).reshape(2, -1)+1, 1)
+        else:
+            self.data[1:-1, 1:-1] = 1
+        self.chambers = np.array([[0], [n], [0], [n]])
+
+
+
+    def __paint(self, rows, cols, color):
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
+
+
+
+    def __divideShared(self):
+        # the remaining chambers are independent, so each worker divides its share in place
+        memory = shared_memory.SharedMemory(create=True, size=self.data.size)
+        try:
+            grid = np.ndarray(self.data.shape, dtype=np.uint8, buffer=memory.buf)
+            grid[:] = self.data
+            count = len(self.chambers[0])
+            chunkSize = -(-count // (4*self.workers))
+            starts = range(0, count, chunkSize)
+            seeds = self.random.generator.integers(2**63, size=len(starts))
+            with ProcessPoolExecutor(self.workers) as pool:
+                tasks = [pool.submit(divisionChunk, memory.name, grid.shape, self.chambers[:, start:start+chunkSize], seed)
+                         for start, seed in zip(starts, seeds)]
+                for task in tasks:
+                    task.result()
+            self.data[:] = grid
+            del grid
+        finally:
+            memory.close()
+            memory.unlink()
+        self.chambers = self.chambers[:, :0]
+
+
+
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
         self.__createPlot()
         self.__createStateSpace()
+        if self.tracing:
+            yield from self.__flush()
+
+        # until every chamber is a corridor, one level of division at a time
+        rows, cols = [], [] # walls drawn in the latest level
+        while len(self.chambers[0]) != 0:
+            if not self.tracing and self.workers is not None and 1 < self.workers <= len(self.chambers[0])//4:
+                self.stats.count("sharedChambers", len(self.chambers[0]))
+                self.stats.start("shared")
+                self.__divideShared()
+                self.stats.stop("shared")
+                break
+            # walls of the latest level turn from red to black
+            self.__paint(rows, cols, 0)
+            self.stats.count("levels")
+            self.stats.count("chambers", len(self.chambers[0]))
+            rows, cols, self.chambers = divideChambers(self.chambers, self.random.generator)
+            if self.tracing:
+                self.__paint(rows, cols, 2) # red
+                yield from self.__flush()
+        self.__paint(rows, cols, 0)
+        if self.tracing:
+            yield from self.__flush()
 
-        # pick a cell as the initial cell to be included in the maze
-        self.maze.append(self.__pickInitial(self.colors[1]))
         self.__updatePlot()
+        self.stats.stop("total")
+        self.__closePlot("end of recursive division algorithm")
 
-        # until all cells in state space are visited 
-        while len(self.space) != 0:
-            # store all neighbour cells of the latest cell added to the maze
-            self.__addNeighbours()
-            # extends the maze by selecting a random neighbour cell
-            self.__connect()
+
+
+    def generate(self):
+        for event in self.__run():
+            pass
+        return self.data
+
+
+
+    def generateSteps(self):
+        # yields [rows, cols, color] for every change of self.data, starting from an empty grid
+        self.tracing = True
+        yield from self.__run()
+
+
+
+def divideChambers(chambers, generator):
+    # splits every chamber in 2 by a wall with 1 gap, across its longer side (a random one for a square)
+    # returns the grid rows and cols of all walls but their gaps, and the sub-chambers still larger than a corridor
+    top, bottom, left, right = chambers
+    height, width = bottom-top, right-left
+    count = len(top)
+    across = (height > width) | ((height == width) & (generator.random(count) < 0.5)) # horizontal walls
+
+    # the wall lies between 2 rows (or cols) of cells, and the gap on one of the cells along it
+    span = np.where(across, height, width)
+    length = np.where(across, width, height)
+    start = np.where(across, top, left)
+    wall = start + 1 + (generator.random(count)*(span-1)).astype(np.int64)
+    gap = (generator.random(count)*length).astype(np.int64)
+
+    # every wall covers the corners at both ends, the gap excluded
+    size = 2*length+1
+    offset = np.arange(size.sum()) - np.repeat(np.cumsum(size)-size, size)
+    keep = offset != np.repeat(2*gap+1, size)
+    along = np.repeat(2*np.where(across, left, top), size) + offset
+    fixed = np.repeat(2*wall, size)
+    horizontal = np.repeat(across, size)
+    rows = np.where(horizontal, fixed, along)[keep]
+    cols = np.where(horizontal, along, fixed)[keep]
+
+    children = np.concatenate((
+        [top, np.where(across, wall, bottom), left, np.where(across, right, wall)],
+        [np.where(across, wall, top), bottom, np.where(across, left, wall), right]), axis=1)
+    divisible = (children[1]-children[0] > 1) & (children[3]-children[2] > 1)
+    return rows, cols, children[:, divisible]
+
+
+
+def divisionChunk(name, shape, chambers, seed):
+    # divide chambers of RecursiveDivision to the end, in the shared memory block of its grid
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        grid = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+        generator = np.random.default_rng(seed)
+        while len(chambers[0]) != 0:
+            rows, cols, chambers = divideChambers(chambers, generator)
+            grid[rows, cols] = 0
+        del grid
+    finally:
+        memory.close()
+
+
+
+class Eller:
+    def __init__(self, mazeSize, height=None, colors=["black", "white"], observer=None, seed=None, stats=False):
+        s = 2*mazeSize+1 
+        self.mazeSize = s
+        self.height = mazeSize if height is None else height # number of cell rows of generate()
+        self.data = np.zeros((2*self.height+1, s))
+
+        self.colors = colors # >= 2, only first 2 will be used
+                             # 1st: walls
+                             # 2nd: paths
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.random = RandomStream(seed) # same seed, same maze
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
+
+
+
+    def __createPlot(self):
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
+
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
+
+
+
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
+
+
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
             self.__updatePlot()
+        return events
+
+
+
+    def __joinRow(self, sets, join):
+        # joins the cells proposed by join (1 per pair of neighbours) unless they already are in the same set
+        # returns the pairs joined, and the set of every cell once merged
+        parent = list(range(len(sets)))
+        joined = []
+        labels = sets.tolist()
+        for i in np.flatnonzero(join).tolist():
+            first, second = labels[i], labels[i+1]
+            while parent[first] != first:
+                parent[first] = first = parent[parent[first]]
+            while parent[second] != second:
+                parent[second] = second = parent[parent[second]]
+            if first != second:
+                parent[first] = second
+                joined.append(i)
+
+        # the root of every set, by pointer jumping
+        parent = np.array(parent)
+        while True:
+            root = parent[parent]
+            if np.array_equal(root, parent):
+                break
+            parent = root
+        pairs = np.zeros(len(join), dtype=bool)
+        pairs[joined] = True
+        return pairs, parent[sets]
+
+
+
+    def generateRows(self, count=None):
+        # yields the rows of data one by one, top border first, for count rows of cells (None: endless)
+        # only the sets of the latest row of cells are kept
+        n = self.mazeSize//2
+        generator = self.random.generator
+        row = np.zeros(self.mazeSize)
+        yield row.copy()
+
+        sets = np.arange(n) # set of each cell of the current row, numbered from 0 to n-1
+        r = 0
+        while count is None or r < count:
+            r += 1
+            last = r == count
+            # join neighbours at random, or all neighbours of different sets on the last row
+            join = np.ones(n-1, dtype=bool) if last else generator.random(n-1) < 0.5
+            joined, sets = self.__joinRow(sets, join)
+            if self.stats.enabled:
+                # neighbours already in the same set are not joined, which would make a loop
+                self.stats.count("rows")
+                self.stats.count("joins", np.count_nonzero(joined))
+                self.stats.count("rejectedJoins", np.count_nonzero(join) - np.count_nonzero(joined))
+            row[:] = 0
+            row[1::2] = 1
+            row[2:-1:2] = joined
+            yield row.copy()
+            if last:
+                break
+
+            # every set goes down at least once, through a random cell if none went down at random
+            down = generator.random(n) < 0.5
+            went = np.zeros(n, dtype=bool)
+            went[sets[down]] = True
+            order = np.lexsort((generator.random(n), sets))
+            first = order[np.unique(sets[order], return_index=True)[1]]
+            down[first[~went[sets[first]]]] = True
+            if self.stats.enabled:
+                self.stats.count("forcedDowns", np.count_nonzero(~went[sets[first]]))
+            row[:] = 0
+            row[1::2] = down
+            yield row.copy()
+
+            # cells not connected from above start new sets, then sets are renumbered from 0
+            sets = np.where(down, sets, n + np.arange(n))
+            sets = np.unique(sets, return_inverse=True)[1].ravel()
+        yield np.zeros(self.mazeSize)
+
+
+
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
+        self.__createPlot()
+
+        for r, row in enumerate(self.generateRows(self.height)):
+            self.data[r] = row
+            if self.tracing:
+                cols = np.flatnonzero(row).tolist()
+                self.events.append([[r]*len(cols), cols, 1])
+                # a step per row of cells, with the walls below it
+                if r%2 == 0:
+                    yield from self.__flush()
 
         self.__updatePlot()
-        print("end of prim algorithm")   
-        plt.ioff()
-        plt.show()
+        self.stats.stop("total")
+        self.__closePlot("end of eller's algorithm")
+
+
+
+    def generate(self):
+        for event in self.__run():
+            pass
         return self.data
+
+
+
+    def generateSteps(self):
+        # yields [rows, cols, color] for every change of self.data, starting from an empty grid
+        self.tracing = True
+        yield from self.__run()
+
+
+
+def generateChunk(name, shape, algorithm, size, start, seeds, options):
+    # generate mazes into the shared memory block of generateBatch, from the index start
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        mazes = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf)
+        for i, seed in enumerate(seeds):
+            mazes[start+i] = algorithm(size, seed=seed, **options).generate()
+        del mazes
+    finally:
+        memory.close()
+
+
+
+def generateBatch(algorithm, size, count, seeds=None, workers=None, **options):
+    # algorithm: any generator class (or its name), e.g. Wilson, options are passed to it
+    # seeds: 1 seed per maze, or an int / None from which independent seeds are spawned
+    if isinstance(algorithm, str):
+        algorithm = globals()[algorithm]
+    if seeds is None or isinstance(seeds, (int, np.integer)):
+        seeds = np.random.SeedSequence(seeds).spawn(count)
+    seeds = list(seeds)
+    if len(seeds) != count:
+        raise ValueError("%d seeds given for %d mazes" % (len(seeds), count))
+    workers = min(os.cpu_count() if workers is None else workers, count)
+    s = 2*size+1
+    shape = (count, s, s)
+
+    if workers <= 1:
+        mazes = np.zeros(shape, dtype=np.uint8)
+        for i, seed in enumerate(seeds):
+            mazes[i] = algorithm(size, seed=seed, **options).generate()
+        return mazes
+
+    # every worker writes its mazes straight into shared memory, so no maze is pickled
+    memory = shared_memory.SharedMemory(create=True, size=count*s*s)
+    try:
+        chunkSize = -(-count // (4*workers)) # a few chunks per worker to balance the load
+        with ProcessPoolExecutor(workers) as pool:
+            tasks = [pool.submit(generateChunk, memory.name, shape, algorithm, size, start, seeds[start:start+chunkSize], options)
+                     for start in range(0, count, chunkSize)]
+            for task in tasks:
+                task.result()
+        mazes = np.ndarray(shape, dtype=np.uint8, buffer=memory.buf).copy()
+    finally:
+        memory.close()
+        memory.unlink()
+    return mazes
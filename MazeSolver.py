@@ -1,114 +1,288 @@
-import matplotlib
-import matplotlib.pyplot as plt
+import heapq
 import numpy as np
+import os
+import shutil
+import tempfile
+from collections import OrderedDict, deque
+from MazeStats import Stats
+
+def breadthFirst(data, source, target=None):
+    # distances from the source over all paths (cells of value 1), -1 if unreached,
+    # and the flattened index of the predecessor of each reached cell, -1 if none
+    height, width = data.shape
+    open = (data == 1).ravel()
+    distance = np.full(open.size, -1, dtype=np.int32)
+    predecessor = np.full(open.size, -1, dtype=np.int32)
+    offsets = np.array([-width, width, -1, 1]) # up, down, left, right
+
+    cell = source[0]*width + source[1]
+    open[cell] = False
+    distance[cell] = 0
+    if target is not None:
+        target = target[0]*width + target[1]
+
+    # expand the whole frontier (all cells at the same distance) at once
+    frontier = np.array([cell])
+    depth = 0
+    while len(frontier) != 0 and (target is None or distance[target] < 0):
+        depth += 1
+        neighbours = (frontier[:, None] + offsets).ravel()
+        parents = np.repeat(frontier, 4)
+        reached = open[neighbours]
+        neighbours, parents = neighbours[reached], parents[reached]
+        # a cell reached from several parents keeps only one of them
+        predecessor[neighbours] = parents
+        unique = predecessor[neighbours] == parents
+        frontier = neighbours[unique]
+        open[frontier] = False
+        distance[frontier] = depth
+
+    return distance.reshape(height, width), predecessor.reshape(height, width)
+
+
+
+def solveBatch(mazes, chunkSize=1024):
+    # solve a stack of mazes (count x rows x cols) from [1, 1] to [rows-2, cols-2] together,
+    # returns the solution masks, and the path lengths (-1 if unreachable)
+    count, height, width = mazes.shape
+    masks = np.zeros(mazes.shape, dtype=bool)
+    lengths = np.full(count, -1, dtype=np.int32)
+    for start in range(0, count, chunkSize):
+        chunk = slice(start, min(start+chunkSize, count))
+        masks[chunk], lengths[chunk] = solveChunk(mazes[chunk])
+    return masks, lengths
+
+
+
+def packBits(cells):
+    # (count, rows, cols) bools to (count, rows, words) uint64, column c is bit c%64 of word c//64
+    count, height, width = cells.shape
+    words = -(-width // 64)
+    bits = np.zeros((count, height, words*8), dtype=np.uint8)
+    bits[:, :, :-(-width // 8)] = np.packbits(cells, axis=-1, bitorder="little")
+    return bits.view("<u8")
+
+
+
+def getBits(words, mazeIdx, rows, cols):
+    return (words[mazeIdx, rows, cols >> 6] >> (cols & 63).astype(np.uint64)) & 1
+
+
+
+def solveChunk(mazes):
+    count, height, width = mazes.shape
+    end = [height-2, width-2]
+    open = packBits(mazes == 1)
+    unvisited = open.copy()
+    lengths = np.full(count, -1, dtype=np.int32)
+
+    frontier = np.zeros(open.shape, dtype=open.dtype)
+    frontier[:, 1, 0] = unvisited[:, 1, 0] & 2 # bit of column 1
+    unvisited ^= frontier
+    grown = np.zeros(open.shape, dtype=open.dtype)
+    # distance from the start of all visited cells modulo 3, as 2 bit planes;
+    # neighbours differ by at most 1 step, so it is enough to walk back
+    planes = [np.zeros(open.shape, dtype=open.dtype), np.zeros(open.shape, dtype=open.dtype)]
+    state = [unvisited, planes[0], planes[1]] # of all mazes, for walking back
+    active = np.arange(count)                 # mazes still expanding
+
+    # expand the wavefronts of all mazes by 1 step at a time, 64 cells per word
+    depth = 0
+    while True:
+        # mazes whose goal is reached stop expanding
+        reached = (frontier[:, end[0], end[1] >> 6] >> np.uint64(end[1] & 63)) & 1 == 1
+        if reached.any():
+            lengths[active[reached]] = depth
+            frontier[reached] = 0
+            # only keep expanding the other mazes once they are half of the active ones
+            running = frontier.reshape(len(active), -1).any(axis=1)
+            if 2*np.count_nonzero(running) <= len(active):
+                for full, part in zip(state, [unvisited] + planes):
+                    full[active] = part
+                active, frontier, unvisited, grown = active[running], frontier[running], unvisited[running], grown[running]
+                planes = [plane[running] for plane in planes]
+        if not frontier.any():
+            break
+
+        depth += 1
+        np.left_shift(frontier, 1, out=grown)              # right
+        grown |= frontier >> 1                             # left
+        grown[:, :, 1:] |= frontier[:, :, :-1] >> 63       # right, across words
+        grown[:, :, :-1] |= frontier[:, :, 1:] << 63       # left, across words
+        grown[:, 1:, :] |= frontier[:, :-1, :]             # down
+        grown[:, :-1, :] |= frontier[:, 1:, :]             # up
+        np.bitwise_and(grown, unvisited, out=frontier)
+        unvisited ^= frontier
+        if depth%3 & 1:
+            planes[0] |= frontier
+        if depth%3 & 2:
+            planes[1] |= frontier
+
+    for full, part in zip(state, [unvisited] + planes):
+        full[active] = part
+    unvisited, planes = state[0], state[1:]
+
+    # walk back from all goals together, each step goes to a visited neighbour 1 step closer to the start
+    masks = np.zeros(mazes.shape, dtype=bool)
+    mazeIdx = np.flatnonzero(lengths >= 0)
+    rows = np.full(len(mazeIdx), end[0])
+    cols = np.full(len(mazeIdx), end[1])
+    steps = lengths[mazeIdx].copy()
+    masks[mazeIdx, rows, cols] = True
+    while True:
+        moving = steps > 0
+        mazeIdx, rows, cols, steps = mazeIdx[moving], rows[moving], cols[moving], steps[moving]
+        if len(mazeIdx) == 0:
+            break
+        closer = (steps-1)%3
+        nextRows, nextCols = rows.copy(), cols.copy()
+        found = np.zeros(len(mazeIdx), dtype=bool)
+        for dr, dc in [[-1, 0], [1, 0], [0, -1], [0, 1]]:
+            visited = getBits(open, mazeIdx, rows+dr, cols+dc) & ~getBits(unvisited, mazeIdx, rows+dr, cols+dc)
+            mod = getBits(planes[0], mazeIdx, rows+dr, cols+dc) | getBits(planes[1], mazeIdx, rows+dr, cols+dc) << 1
+            step = ~found & (visited == 1) & (mod == closer)
+            nextRows[step] = rows[step]+dr
+            nextCols[step] = cols[step]+dc
+            found |= step
+        rows, cols, steps = nextRows, nextCols, steps-1
+        masks[mazeIdx, rows, cols] = True
+    return masks, lengths
+
+
 
 class Dijkstra:
-    def __init__(self, data, colors=['black', 'white', 'red', 'green']):
+    def __init__(self, data, colors=['black', 'white', 'red', 'green'], observer=None, stats=False):
         self.data = data
         self.start = [1, 1]                   # starting point of the maze
         self.end = [len(data)-2, len(data)-2] # goal of the maze
 
-        self.current = [self.start]                             # all cells to be visited in the next step
-        self.traversed = [{"cell": self.start, "parent": None}] # all visited cells, and their parent correspondingly
+        self.distance = None    # distance of all visited cells from the start, -1 if not visited
+        self.predecessor = None # parent of all visited cells, flattened, -1 if none
+        self.found = False      # whether the goal is reached
 
         self.colors = colors # >= 4, only first 4 will be used
                              # 1st: walls
                              # 2nd: all paths
                              # 3rd: visited paths
                              # 4th: final path (solution)
-        self.bounds = [colors.index(x) for x in colors]
-        self.figure = plt.figure()
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
 
 
 
     def __createPlot(self):
-        plt.ion()
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
+
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
 
-        cmap = matplotlib.colors.ListedColormap(self.colors)
-        norm = matplotlib.colors.BoundaryNorm(self.bounds, cmap.N-1)
 
-        axis = self.figure.add_subplot()
-        axis.set_xticks(ticks=[])
-        axis.set_yticks(ticks=[])
-        self.mazeImage = axis.imshow(self.data, cmap=cmap, norm=norm)
 
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
+
+
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
 
 
-    def __updatePlot(self, time=0.001):
-        self.mazeImage.set_data(self.data)
-        self.figure.canvas.draw()
-        plt.pause(time) # delay between plot updates
-        self.figure.canvas.flush_events()
+
+    def __paint(self, rows, cols, color):
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
 
 
 
     def __explore(self):
-        next = []
-        # find all neighbours of all cells in an iteration
-        for path in self.current:
-            for cell in self.__neighbour(path):
-                if self.data[cell[0]][cell[1]] == 1:
-                    if cell[0] > 0 and cell[1] > 0 and cell[0] < len(self.data) and cell[1] < len(self.data):
-                        self.traversed.append({"cell": cell, "parent": path})
-                        next.append(cell)
-                        self.data[cell[0]][cell[1]] = 2
-                        self.__updatePlot()
-        return next
-    
+        self.distance, self.predecessor = breadthFirst(self.data, self.start, self.end)
+        if self.stats.enabled:
+            self.stats.count("visited", np.count_nonzero(self.distance >= 0))
+            self.stats.count("layers", self.distance.max()+1)
 
+        # replay all cells visited in an iteration
+        if self.tracing:
+            width = len(self.data[0])
+            distance = self.distance.ravel()
+            visited = np.flatnonzero(distance >= 0)
+            visited = visited[np.argsort(distance[visited], kind="stable")]
+            counts = np.bincount(distance[visited])
+            for cells in np.split(visited, np.cumsum(counts)[:-1]):
+                self.__paint(*np.divmod(cells, width), 2)
+                yield from self.__flush()
+        return self.distance[self.end[0], self.end[1]] >= 0
 
-    def __neighbour(self, cell):
-        return [[cell[0]-1, cell[1]], [cell[0]+1, cell[1]], [cell[0], cell[1]-1], [cell[0], cell[1]+1]]
-    
 
 
     def __backTrack(self):
-        self.data[self.current["cell"][0]][self.current["cell"][1]] = 3
-        for item in self.traversed:
-            if item["cell"] == self.current["parent"]:
-                self.current = item
+        width = len(self.data[0])
+        cell = self.end[0]*width + self.end[1]
+        while cell >= 0:
+            self.__paint(*divmod(int(cell), width), 3)
+            cell = self.predecessor.flat[cell]
+            if self.tracing:
+                yield from self.__flush()
 
 
 
     def __displayPathOnly(self):
-        for i in range(len(self.data)):
-            for j in range(len(self.data)):
-                if self.data[i][j] == 2:
-                    self.data[i][j] = 1
+        self.__paint(*np.nonzero(self.data == 2), 1)
 
 
 
-    def solve(self):
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
         self.__createPlot()
-        self.data[self.start[0]][self.start[1]] = 2
 
-        while self.end not in self.current:
-            # extends the path and store all newly added cells for next iteration
-            self.current = self.__explore()
-        
-        # mark the starting cell (goal) for backtracking
-        for item in self.traversed:
-            if item["cell"] == self.end:
-                self.current = item
-        
-        # backtracking
-        while self.current["parent"] != None:
-            # connect the parent
-            self.__backTrack()
-            self.__updatePlot() 
-            
-        self.data[self.start[0]][self.start[1]] = 3
+        # extends the path until the goal is reached
+        self.stats.start("search")
+        self.found = yield from self.__explore()
+        self.stats.stop("search")
+        # backtracking from the goal
+        if self.found:
+            self.stats.start("backtrack")
+            yield from self.__backTrack()
+            self.stats.stop("backtrack")
+
         self.__displayPathOnly() 
+        if self.tracing:
+            yield from self.__flush()
 
         self.__updatePlot()
-        print("end of dijkstra algorithm")   
-        plt.ioff()
-        plt.show()
+        self.stats.stop("total")
+        self.__closePlot("end of dijkstra algorithm")
+
+
+
+    def solve(self):
+        for event in self.__run():
+            pass
+        return self.found
+
+
+
+    def solveSteps(self):
+        # yields [rows, cols, color] for every change of self.data, self.found is set once exhausted
+        self.tracing = True
+        yield from self.__run()
 
 
 
 class Astar:
-    def __init__(self, data, heurFunc="Manhattan", colors=['black', 'white', 'red', 'green']):
+    def __init__(self, data, heurFunc="Manhattan", colors=['black', 'white', 'red', 'green'], observer=None, stats=False):
         self.data = data
         self.start = [1, 1]                   # starting point of the maze
         self.end = [len(data)-2, len(data)-2] # goal of the maze
@@ -116,369 +290,1491 @@ class Astar:
         self.heurCost = [] # predicted costs of all cells to the goal
         self.heurFunc = heurFunc
 
-        self.chosen = {"cell": self.start, "parent": None} # the selected cell, and the parent correspondingly
-        self.active = [self.chosen]                        # all possible cells, and their parent correspondingly
-        self.traversed = [self.chosen]                     # all visited cells, and their parent correspondingly
+        self.cost = None    # cost from the start of all reached cells, flattened
+        self.parent = None  # parent of all reached cells, flattened, -1 if none
+        self.visited = None # whether each cell is visited, flattened
+        self.active = []    # heap of all possible cells, as [cost + predicted cost, predicted cost, cell]
+        self.found = False  # whether the goal is reached
 
         self.colors = colors # >= 4, only first 4 will be used
                              # 1st: walls
                              # 2nd: all paths
                              # 3rd: visited paths
                              # 4th: final path (solution)
-        self.bounds = [colors.index(item) for item in colors]
-        self.figure = plt.figure()
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
 
 
 
     def __createPlot(self):
-        plt.ion()
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
+
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
+
 
-        cmap = matplotlib.colors.ListedColormap(self.colors)
-        norm = matplotlib.colors.BoundaryNorm(self.bounds, cmap.N-1)
 
-        self.axis = self.figure.add_subplot()
-        self.axis.set_xticks(ticks=[])
-        self.axis.set_yticks(ticks=[])
-        self.mazeImage = self.axis.imshow(self.data, cmap=cmap, norm=norm)
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
 
 
 
-    def __updatePlot(self, time=0.001):
-        self.mazeImage.set_data(self.data)
-        self.figure.canvas.draw()
-        plt.pause(time) # delay between plot updates
-        self.figure.canvas.flush_events()
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
+
+
+
+    def __paint(self, rows, cols, color):
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
 
 
 
     def __setHeurCost(self, heurFunc):
         # Manhattan distance
         if heurFunc == "Manhattan":
-            for i in range(len(self.data)):
-                temp= []
-                for j in range(len(self.data[i])):
-                    if int(self.data[i][j]) == 1:
-                        cost = self.end[0]-i + self.end[1]-j # dist
-                        temp.append(cost)
-                    else:
-                        temp.append(float("inf"))
-                self.heurCost.append(temp)
+            rows, cols = np.indices(self.data.shape)
+            self.heurCost = (np.abs(self.end[0]-rows) + np.abs(self.end[1]-cols)).astype(float) # dist
+            self.heurCost[self.data != 1] = float("inf")
         # BFS with back propagation
         elif heurFunc == "BackBFS":
-            cell = self.end
-            cost = 0
-            h_traversed = []
-            h_active = [cell]
-            h_next= [[cell, None]]
-
             # until the starting point is reached
-            while self.start not in [x[0] for x in h_traversed]:
-                current, parent = h_next.pop(0)
-                h_active.pop(0)
-                if current not in [x[0] for x in h_traversed]:
-                    h_traversed.append((current, parent, cost))
-                    cell = current
-                    neighbours = [[cell[0]-1, cell[1]], [cell[0]+1, cell[1]], [cell[0], cell[1]-1], [cell[0], cell[1]+1]]
-                    for neighbour in neighbours:
-                        if self.data[neighbour[0]][neighbour[1]] == 1 and neighbour[0] >= 0 and neighbour[1] >= 0 and neighbour[0] < len(self.data) and neighbour[1] < len(self.data):
-                            h_next.append([neighbour, current])
-                # depth + 1
-                if len(h_active) == 0:
-                    for path in h_next:
-                        h_active.append(path)
-                    cost += 1
-            
-            # map costs to cells
-            self.heurCost = np.full((len(self.data), len(self.data)), float("inf"))
-            for item in h_traversed:
-                cell = item[0]
-                if self.data[cell[0]][cell[1]] == 1:
-                    self.heurCost[cell[0]][cell[1]] = item[2]
-                    # display only on small maze
-                    if len(self.data) <= 21: # =10x10
-                        self.axis.text(cell[1],cell[0], item[2], ha='center', va='center')
-                        self.__updatePlot()
-            
-
-
-    def __addNeighbours(self):
-        self.active.remove(self.chosen)
-
-        cell = self.chosen["cell"]
-        neighbours = [[cell[0]-1, cell[1]], [cell[0]+1, cell[1]], [cell[0], cell[1]-1], [cell[0], cell[1]+1]]
-        for neighbour in neighbours:
-            # limitation of boundaries are omitted, and replaced by wall detection
-            if self.heurCost[neighbour[0]][neighbour[1]] != float("inf") and neighbour not in [item["cell"] for item in self.traversed]:
-                self.active.append({"cell": neighbour, "parent": self.chosen["cell"]})
+            distance = breadthFirst(self.data, self.end, self.start)[0]
+            self.heurCost = distance.astype(float)
+            self.heurCost[distance < 0] = float("inf")
 
+            # display only on small maze, and only on observers that can annotate
+            annotate = getattr(self.observer, "annotate", None)
+            if annotate is not None and len(self.data) <= 21: # =10x10
+                for cell in np.argwhere(distance >= 0):
+                    annotate(cell, distance[cell[0], cell[1]])
+                    self.__updatePlot()
 
 
-    def __findMinimum(self):
-        min = float("inf")
-        for cell in [item["cell"] for item in self.active]:
-            if self.heurCost[cell[0]][cell[1]] < min:
-                min = self.heurCost[cell[0]][cell[1]]
-        return min
-    
 
+    def __addNeighbours(self, cell):
+        width = len(self.data[0])
+        cost = self.cost[cell] + 1
+        for neighbour in [cell-width, cell+width, cell-1, cell+1]:
+            # limitation of boundaries are omitted, and replaced by wall detection
+            heurCost = self.heurCost.flat[neighbour]
+            if heurCost != float("inf") and not self.visited[neighbour] and cost < self.cost[neighbour]:
+                self.cost[neighbour] = cost
+                self.parent[neighbour] = cell
+                heapq.heappush(self.active, [cost + heurCost, heurCost, neighbour])
 
-    def __explore(self, minCost):
-        for item in self.active:
-            cell = item["cell"]
-            if self.heurCost[cell[0]][cell[1]] == minCost:
-                self.traversed.append(item)
-                self.chosen = item
-                self.data[cell[0]][cell[1]] = 2
+
+
+    def __explore(self):
+        width = len(self.data[0])
+        start = self.start[0]*width + self.start[1]
+        end = self.end[0]*width + self.end[1]
+
+        self.cost = np.full(self.data.size, np.iinfo(np.int64).max, dtype=np.int64)
+        self.parent = np.full(self.data.size, -1, dtype=np.int64)
+        self.visited = np.zeros(self.data.size, dtype=bool)
+        self.cost[start] = 0
+        self.active = [[self.heurCost.flat[start], self.heurCost.flat[start], start]]
+        pops, peak = 0, 1
+
+        # until goal is reached, or no more possible cells
+        while len(self.active) != 0:
+            if len(self.active) > peak:
+                peak = len(self.active)
+            # choose the minimum-cost move
+            cell = heapq.heappop(self.active)[2]
+            pops += 1
+            if self.visited[cell]:
+                continue
+            # add the move to visited
+            self.visited[cell] = True
+            if self.tracing:
+                self.__paint(*divmod(cell, width), 2)
+                yield from self.__flush()
+            if cell == end:
+                break
+            self.__addNeighbours(cell)
+
+        # a cell pushed again with a lower cost leaves a stale entry, skipped once popped
+        if self.stats.enabled:
+            expansions = np.count_nonzero(self.visited)
+            self.stats.count("expansions", expansions)
+            self.stats.count("pushes", pops + len(self.active))
+            self.stats.count("stalePops", pops - expansions)
+            self.stats.peak("peakFrontier", peak)
+        return bool(self.visited[end])
 
 
 
     def __backTrack(self):
-        for text in self.axis.texts:
-            text.set_visible(False)
+        # only BackBFS annotates the cells
+        clearAnnotations = getattr(self.observer, "clearAnnotations", None)
+        if clearAnnotations is not None and self.heurFunc == "BackBFS":
+            clearAnnotations()
         self.__updatePlot()  
 
-        for item in self.traversed:
-            cell= item["cell"]
-            if cell == self.chosen["parent"]:
-                self.chosen = item
-                self.data[cell[0]][cell[1]] = 3  
+        width = len(self.data[0])
+        cell = self.end[0]*width + self.end[1]
+        while cell >= 0:
+            self.__paint(*divmod(int(cell), width), 3)
+            cell = self.parent[cell]
+            if self.tracing:
+                yield from self.__flush()
 
 
 
     def __displayPathOnly(self):
-        for i in range(len(self.data)):
-            for j in range(len(self.data)):
-                if self.data[i][j] == 2:
-                    self.data[i][j] = 1
+        self.__paint(*np.nonzero(self.data == 2), 1)
         
 
-    def solve(self):
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
         self.__createPlot()
+        self.stats.start("heuristic")
         self.__setHeurCost(self.heurFunc)
-        self.data[self.start[0]][self.start[1]] = 2
-
-        # until goal is reached
-        while self.heurCost[self.chosen["cell"][0]][self.chosen["cell"][1]] != 0:
-            self.__addNeighbours()
-
-            # choose the minimum-cost move
-            minCost = self.__findMinimum()
-            # add the move to visited
-            self.__explore(minCost)
-            self.__updatePlot()
+        self.stats.stop("heuristic")
 
-        # mark the starting cell (goal) for backtracking
-        self.chosen = self.traversed[-1]
-        self.data[self.chosen["cell"][0]][self.chosen["cell"][1]] = 3
-        
-        # backtracking
-        while self.chosen["parent"] != None:
-            # connects the parent
-            self.__backTrack()
-            self.__updatePlot()
+        # search the goal, then connect the parents from the goal
+        self.stats.start("search")
+        self.found = yield from self.__explore()
+        self.stats.stop("search")
+        if self.found:
+            self.stats.start("backtrack")
+            yield from self.__backTrack()
+            self.stats.stop("backtrack")
 
         self.__displayPathOnly() 
+        if self.tracing:
+            yield from self.__flush()
 
         self.__updatePlot()
-        print("end of astar algorithm")   
-        plt.ioff()
-        plt.show()   
+        self.stats.stop("total")
+        self.__closePlot("end of astar algorithm")
+
+
+
+    def solve(self):
+        for event in self.__run():
+            pass
+        return self.found
+
+
+
+    def solveSteps(self):
+        # yields [rows, cols, color] for every change of self.data, self.found is set once exhausted
+        self.tracing = True
+        yield from self.__run()
 
 
 
 class DeadEndFill:
-    def __init__(self, data, colors=['black', 'white', 'red', 'green']):
+    def __init__(self, data, mode="vectorized", colors=['black', 'white', 'red', 'green'], observer=None, stats=False):
         self.data = data
         self.start = [1, 1]                   # starting point of the maze
         self.end = [len(data)-2, len(data)-2] # goal of the maze
+        self.mode = mode # "vectorized": fill all dead ends of the maze at once, "queue": fill one dead end at a time
 
-        self.active = [0] # cells to be explored in the next iteration
+        self.open = None  # unvisited / accepted cells
+        self.count = None # number of unvisited / accepted neighbours of each cell
+        self.candidates = None # flattened cells that may have become dead ends since the latest pass
+        self.found = False # whether the goal is reached
 
         self.colors = colors # >= 4, only first 4 will be used
                              # 1st: walls
                              # 2nd: unvisited / accepted paths
                              # 3rd: visited (=rejected) paths
                              # 4th: final path (solution)
-        self.bounds = [colors.index(x) for x in colors]
-        self.figure = plt.figure()
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
 
 
 
     def __createPlot(self):
-        plt.ion()
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
 
-        cmap = matplotlib.colors.ListedColormap(self.colors)
-        norm = matplotlib.colors.BoundaryNorm(self.bounds, cmap.N-1)
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
 
-        axis = self.figure.add_subplot()
-        axis.set_xticks(ticks=[])
-        axis.set_yticks(ticks=[])
-        self.mazeImage = axis.imshow(self.data, cmap=cmap, norm=norm)
 
 
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
 
-    def __updatePlot(self, time=0.001):
-        self.mazeImage.set_data(self.data)
-        self.figure.canvas.draw()
-        plt.pause(time) # delay between plot updates
-        self.figure.canvas.flush_events()
 
 
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
+
+
+
+    def __paint(self, rows, cols, color):
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
 
-    def __checkCellType(self, cell):
-        lst = [self.data[cell[0]-1][cell[1]], self.data[cell[0]+1][cell[1]], self.data[cell[0]][cell[1]-1], self.data[cell[0]][cell[1]+1]]
-        return lst.count(1) # 1: dead end
-                            # 2: path
-                            # 3: junction
-                            # 4: junction
+
+
+    def __countNeighbours(self, cells):
+        # sum of the 4 shifted grids
+        count = np.zeros(cells.shape, dtype=np.int8)
+        count[1:, :] += cells[:-1, :]
+        count[:-1, :] += cells[1:, :]
+        count[:, 1:] += cells[:, :-1]
+        count[:, :-1] += cells[:, 1:]
+        return count
 
 
 
     def __explore(self):
-        self.active = []
-        for i in range(len(self.data)):
-            for j in range(len(self.data[i])):
-                # start and end are compulsory
-                if [i, j] != self.start and [i, j] != self.end:
-                    # dead end
-                    if self.data[i][j] == 1 and self.__checkCellType([i, j]) == 1:
-                        self.active.append([i, j])
-        
-        for cell in self.active:
-            self.data[cell[0]][cell[1]] = 2 #red
+        # dead ends have only 1 accepted neighbour, while start and end are compulsory
+        # only the candidates are checked, so a pass costs the size of the latest layer and not of the grid
+        width = len(self.data[0])
+        open, count = self.open.ravel(), self.count.ravel()
+        deadEnds = self.candidates[open[self.candidates] & (count[self.candidates] == 1)]
+        deadEnds = deadEnds[(deadEnds != self.start[0]*width + self.start[1]) & (deadEnds != self.end[0]*width + self.end[1])]
+        if len(deadEnds) == 0:
+            return False
+        if self.stats.enabled:
+            self.stats.count("passes")
+            self.stats.count("filled", len(deadEnds))
+
+        # the next candidates are the accepted neighbours of the filled dead ends
+        open[deadEnds] = False
+        neighbours = (deadEnds[:, None] + np.array([-width, width, -1, 1])).ravel()
+        np.subtract.at(count, neighbours, 1)
+        self.candidates = np.unique(neighbours[open[neighbours]])
+        self.__paint(*np.divmod(deadEnds, width), 2) #red
+        return True
+
+
+
+    def __exploreQueue(self):
+        width = len(self.data[0])
+        open = self.open.ravel().tolist()
+        count = self.count.ravel().tolist()
+        compulsory = [self.start[0]*width + self.start[1], self.end[0]*width + self.end[1]]
+        filled = []
+
+        # start from all dead ends, and only re-examine the neighbours of the filled ones
+        queue = deque(np.flatnonzero(self.open & (self.count == 1)).tolist())
+        pops = 0
+        while len(queue) != 0:
+            cell = queue.popleft()
+            pops += 1
+            if not open[cell] or count[cell] != 1 or cell in compulsory:
+                continue
+            open[cell] = False
+            filled.append(cell)
+            for neighbour in [cell-width, cell+width, cell-1, cell+1]:
+                if open[neighbour]:
+                    count[neighbour] -= 1
+                    if count[neighbour] == 1:
+                        queue.append(neighbour)
+
+            if self.tracing:
+                self.__paint(*divmod(cell, width), 2) #red
+                yield from self.__flush()
+        # a cell may be queued again before it is a dead end, or after it is filled
+        self.stats.count("queuePops", pops)
+        self.stats.count("filled", len(filled))
+
+        if not self.tracing:
+            rows, cols = np.divmod(np.array(filled, dtype=np.int64), width)
+            self.data[rows, cols] = 2 #red
 
 
 
     def __displayFinalPath(self):
-        for i in range(len(self.data)):
-            for j in range(len(self.data[i])):
-                if self.data[i][j] == 1:
-                    self.data[i][j] = 3
-                elif self.data[i][j] == 2:
-                    self.data[i][j] = 1
+        solution = np.nonzero(self.data == 1)
+        self.__paint(*np.nonzero(self.data == 2), 1)
+        self.__paint(*solution, 3)
 
 
 
-    def solve(self):
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
         self.__createPlot()
+        self.open = self.data == 1
+        self.count = self.__countNeighbours(self.open)
+        self.candidates = np.flatnonzero(self.open & (self.count == 1))
 
-        # until no dead end in the path
-        while len(self.active) != 0:
-            # add all dead ends to the "rejected list"
-            self.__explore()
-            self.__updatePlot()
-        
+        self.stats.start("fill")
+        if self.mode == "queue":
+            yield from self.__exploreQueue()
+        else:
+            # until no dead end in the path
+            while self.__explore():
+                # add all dead ends to the "rejected list"
+                if self.tracing:
+                    yield from self.__flush()
+        self.stats.stop("fill")
+
+        # the cells left connect the start to the goal, unless they are not in the same part of the maze
+        self.found = False
+        if self.data[self.start[0], self.start[1]] == 1 and self.data[self.end[0], self.end[1]] == 1:
+            self.found = bool(breadthFirst(self.data, self.start, self.end)[0][self.end[0], self.end[1]] >= 0)
         self.__displayFinalPath()
+        if self.tracing:
+            yield from self.__flush()
 
-        print("end of dead end fill algorithm")   
-        plt.ioff()
-        plt.show()
+        self.stats.stop("total")
+        self.__closePlot("end of dead end fill algorithm")
+
+
+
+    def solve(self):
+        for event in self.__run():
+            pass
+        return self.found
+
+
+
+    def solveSteps(self):
+        # yields [rows, cols, color] for every change of self.data, self.found is set once exhausted
+        self.tracing = True
+        yield from self.__run()
 
 
 class WallFollow:
-    def __init__(self, data, mode="left", colors=['black', 'white', 'red', 'green']):
+    def __init__(self, data, mode="left", colors=['black', 'white', 'red', 'green'], observer=None, maxSteps=None, stats=False):
         self.data = data
         self.start = [1, 1]                   # starting point of the maze
         self.end = [len(data)-2, len(data)-2] # goal of the maze
 
-        self.cell = self.start                            # current cell
-        self.directions = ["right", "down", "left", "up"] # possible directions
-        self.direction = "right"                          # current direction
-
-        self.traversed = [self.start] # all visited cells
+        self.heading = 1 # current direction, clockwise: 0 up, 1 right, 2 down, 3 left
+        self.maxSteps = maxSteps # max number of moves and turns, None stops only when the walk repeats itself
+        self.found = False       # whether the goal is reached
 
-        # Left-hand or right-hand follower
+        # Left-hand or right-hand follower, as the turn towards the hand
         if mode == "left":
-            self.k = 0
+            self.hand = 3
         elif mode== "right":
-            self.k = 2
+            self.hand = 1
 
         self.colors = colors # >= 4, only first 4 will be used
                              # 1st: walls
                              # 2nd: unvisited / accepted paths
                              # 3rd: visited (=rejected) paths
                              # 4th: final path (solution)
-        self.bounds = [colors.index(x) for x in colors]
-        self.figure = plt.figure()
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
 
 
 
     def __createPlot(self):
-        plt.ion()
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
 
-        cmap = matplotlib.colors.ListedColormap(self.colors)
-        norm = matplotlib.colors.BoundaryNorm(self.bounds, cmap.N-1)
 
-        axis = self.figure.add_subplot()
-        axis.set_xticks(ticks=[])
-        axis.set_yticks(ticks=[])
-        self.mazeImage = axis.imshow(self.data, cmap=cmap, norm=norm)
 
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
 
 
-    def __updatePlot(self, time=0.001):
-        self.mazeImage.set_data(self.data)
-        self.figure.canvas.draw()
-        plt.pause(time) # delay between plot updates
-        self.figure.canvas.flush_events()
 
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
 
 
-    def __findNextPossible(self):
-        cell = self.cell
-        neighbours = [[cell[0]-1, cell[1]], [cell[0], cell[1]+1], [cell[0]+1, cell[1]], [cell[0], cell[1]-1]]
-        side = (self.directions.index(self.direction)+self.k)%4
-        front = (self.directions.index(self.direction)+1)%4
-        return neighbours[side], neighbours[front]
 
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
 
 
-    def __explore(self, newCell):
-        if newCell not in self.traversed:
-            self.traversed.append(newCell)
-            self.data[self.cell[0]][self.cell[1]] = 3
-        else:
-            self.data[self.cell[0]][self.cell[1]] = 2
+
+    def __paint(self, rows, cols, color):
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
+
+
+
+    def __explore(self):
+        width = len(self.data[0])
+        offsets = [-width, 1, width, -1] # clockwise from up, as the headings
+        open = (self.data != 0).ravel().tolist()
+        cell = self.start[0]*width + self.start[1]
+        end = self.end[0]*width + self.end[1]
+        heading = self.heading
+
+        visited = bytearray(self.data.size) # whether each cell is visited
+        seen = bytearray(self.data.size)    # headings already held in each cell, 1 bit each
+        color = bytearray(self.data.size)   # latest color of each cell left, painted at the end when headless
+        visited[cell] = True
+        steps, moves = 0, 0
+
+        # until goal is reached
+        while cell != end:
+            # the walk only depends on the cell and the heading, so the same pair twice is an endless loop
+            if seen[cell] >> heading & 1 or steps == self.maxSteps:
+                self.stats.count("moves", moves)
+                self.stats.count("turns", steps-moves)
+                return False
+            seen[cell] |= 1 << heading
+            steps += 1
+
+            # rotate to the "hand direction"
+            side = (heading+self.hand)%4
+            if open[cell+offsets[side]]:
+                heading = side
+            # rotate to the opposite of the "hand direction"
+            elif not open[cell+offsets[heading]]:
+                heading = (heading-self.hand)%4
+                continue
+
+            # move forward, the cell left is rejected when the walk comes back on its own trail
+            moves += 1
+            next = cell + offsets[heading]
+            color[cell] = 2 if visited[next] else 3
+            visited[next] = True
+            if self.tracing:
+                self.__paint(*divmod(cell, width), color[cell])
+                yield from self.__flush()
+            cell = next
+        # a turn towards the hand is followed by a move in the same step
+        self.stats.count("moves", moves)
+        self.stats.count("turns", steps-moves)
+
+        if not self.tracing:
+            self.data.flat[np.flatnonzero(np.frombuffer(color, dtype=np.uint8) == 3)] = 3
+        self.__paint(*divmod(end, width), 3)
+        return True
 
 
 
     def __displayPathOnly(self):
-        for i in range(len(self.data)):
-            for j in range(len(self.data)):
-                if self.data[i][j] == 2:
-                    self.data[i][j] = 1 
+        # only the accepted cells are kept when the goal is reached, none otherwise
+        self.__paint(*np.nonzero(self.data == 2), 1)
+        if not self.found:
+            self.__paint(*np.nonzero(self.data == 3), 1)
+
+
+
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
+        self.__createPlot()
+
+        self.stats.start("search")
+        self.found = yield from self.__explore()
+        self.stats.stop("search")
+
+        self.__displayPathOnly()
+        if self.tracing:
+            yield from self.__flush()
+        
+        self.__updatePlot()
+        self.stats.stop("total")
+        self.__closePlot("end of wall follow algorithm")
+
 
 
     def solve(self):
+        for event in self.__run():
+            pass
+        return self.found
+
+
+
+    def solveSteps(self):
+        # yields [rows, cols, color] for every change of self.data, self.found is set once exhausted
+        self.tracing = True
+        yield from self.__run()
+
+
+
+class FloodFill:
+    def __init__(self, data, colors=['black', 'white', 'red', 'green'], observer=None, stats=False):
+        self.data = data
+        self.start = [1, 1]                   # starting point of the maze
+        self.end = [len(data)-2, len(data)-2] # goal of the maze
+
+        self.distance = None    # distances from the start and from the goal, flattened, -1 if not reached
+        self.predecessor = None # parent of all visited cells on either side, flattened, -1 if none
+        self.meeting = None  # 2 adjacent cells where the wavefronts touch, reached from the start and from the goal
+        self.found = False   # whether the goal is reached
+
+        self.colors = colors # >= 4, only first 4 will be used
+                             # 1st: walls
+                             # 2nd: all paths
+                             # 3rd: visited paths
+                             # 4th: final path (solution)
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
+
+
+
+    def __createPlot(self):
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
+
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
+
+
+
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
+
+
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
+            self.__updatePlot()
+        return events
+
+
+
+    def __paint(self, rows, cols, color):
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
+
+
+
+    def __explore(self):
+        width = len(self.data[0])
+        open = (self.data == 1).ravel()
+        offsets = np.array([-width, width, -1, 1])
+        start = self.start[0]*width + self.start[1]
+        end = self.end[0]*width + self.end[1]
+
+        self.distance = [np.full(open.size, -1, dtype=np.int32), np.full(open.size, -1, dtype=np.int32)]
+        self.distance[0][start] = 0
+        self.distance[1][end] = 0
+        self.predecessor = np.full(open.size, -1, dtype=np.int32)
+        if start == end:
+            self.meeting = [start, end]
+            return True
+
+        # the wavefronts of the start and the goal, flattened
+        fronts = [np.array([start]), np.array([end])]
+        depths = [0, 0]
+        while len(fronts[0]) != 0 and len(fronts[1]) != 0:
+            # the smaller wavefront grows by a whole layer
+            side = 0 if len(fronts[0]) <= len(fronts[1]) else 1
+            other = 1 - side
+            parents = np.repeat(fronts[side], 4)
+            neighbours = (fronts[side][:, None] + offsets).ravel()
+            reached = open[neighbours] & (self.distance[side][neighbours] < 0)
+            parents, neighbours = parents[reached], neighbours[reached]
+
+            # the fronts touch: the shortest path crosses the contact closest to the other end
+            touching = self.distance[other][neighbours] >= 0
+            if touching.any():
+                touching = np.flatnonzero(touching)
+                best = touching[np.argmin(self.distance[other][neighbours[touching]])]
+                self.meeting = [int(parents[best]), int(neighbours[best])][::1 if side == 0 else -1]
+                return True
+
+            # a cell reached from several parents keeps only one of them
+            self.predecessor[neighbours] = parents
+            depths[side] += 1
+            self.stats.count("layersFromStart" if side == 0 else "layersFromGoal")
+            fronts[side] = neighbours[self.predecessor[neighbours] == parents]
+            self.distance[side][fronts[side]] = depths[side]
+            if self.tracing:
+                self.__paint(*np.divmod(fronts[side], width), 2)
+                yield from self.__flush()
+        return False
+
+
+
+    def __backTrack(self):
+        # both halves of the path, from the meeting point to their own end
+        width = len(self.data[0])
+        for cell in self.meeting:
+            while cell >= 0:
+                self.__paint(*divmod(int(cell), width), 3)
+                cell = self.predecessor[cell]
+                if self.tracing:
+                    yield from self.__flush()
+
+
+
+    def __displayPathOnly(self):
+        self.__paint(*np.nonzero(self.data == 2), 1)
+
+
+
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
         self.__createPlot()
 
-        # until goal is reached
-        while self.cell != self.end:
-            # find possible move
-            side, front = self.__findNextPossible()
-            self.data[side[0]][side[1]]
-            self.data[front[0]][front[1]]
+        # grows both wavefronts until they touch
+        self.stats.start("search")
+        self.found = yield from self.__explore()
+        self.stats.stop("search")
+        if self.stats.enabled:
+            self.stats.count("visited", sum(np.count_nonzero(distance >= 0) for distance in self.distance))
+        # backtracking from the meeting point to both ends
+        if self.found:
+            self.stats.start("backtrack")
+            yield from self.__backTrack()
+            self.stats.stop("backtrack")
 
-            # rotate to the "hand direction"
-            if self.data[side[0]][side[1]] != 0:
-                self.direction = self.directions[(self.directions.index(self.direction)+3+self.k)%4]
-                self.__explore(side)
-                self.cell = side
+        self.__displayPathOnly()
+        if self.tracing:
+            yield from self.__flush()
 
-            # move forward
-            elif self.data[front[0]][front[1]] != 0:
-                self.__explore(front)
-                self.cell = front
+        self.__updatePlot()
+        self.stats.stop("total")
+        self.__closePlot("end of flood fill algorithm")
 
-            # rotate to the opposite of the "hand direction"
-            else:
-                self.direction = self.directions[(self.directions.index(self.direction)+1+self.k)%4]
+
+
+    def solve(self):
+        for event in self.__run():
+            pass
+        return self.found
+
+
+
+    def solveSteps(self):
+        # yields [rows, cols, color] for every change of self.data, self.found is set once exhausted
+        self.tracing = True
+        yield from self.__run()
+
+
+
+class LPAstar:
+    def __init__(self, data, colors=['black', 'white', 'red', 'green'], observer=None, stats=False):
+        self.data = data
+        self.start = [1, 1]                   # starting point of the maze
+        self.end = [len(data)-2, len(data)-2] # goal of the maze
+
+        # the search state is kept between runs, so a run after setWall only repairs what the edits changed
+        self.open = None # whether each cell is a path, flattened, kept up to date by setWall
+        self.g = None    # cost from the start of all cells, as of their latest expansion, as a flattened list
+        self.rhs = None  # cost from the start of all cells, through the g of their neighbours, as a flattened list
+                         # a cell is searched again only while both costs differ
+        self.active = [] # heap of all cells whose costs differ, as [min(g, rhs) + predicted cost, min(g, rhs), cell]
+        self.path = []   # cells of the latest solution from the goal to the start, flattened
+        self.found = False # whether the goal is reached
+
+        self.colors = colors # >= 4, only first 4 will be used
+                             # 1st: walls
+                             # 2nd: all paths
+                             # 3rd: visited paths
+                             # 4th: final path (solution)
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+        self.observer = self.stats.watch(observer) # optional visualizer, None runs headless
+        self.tracing = observer is not None # whether every change is recorded as a step
+        self.events = [] # changes since the latest step, as [rows, cols, color]
+        self.visited = [] # cells painted as visited during the latest run, flattened
+
+
+
+    def __createPlot(self):
+        if self.observer is not None:
+            self.observer.start(self.data, self.colors)
+
+
+
+    def __updatePlot(self):
+        if self.observer is not None:
+            self.observer.update(self.data)
+
+
+
+    def __closePlot(self, message):
+        if self.observer is not None:
+            self.observer.finish(self.data, message)
+
+
+
+    def __flush(self):
+        # all changes since the latest step
+        events, self.events = self.events, []
+        if len(events) != 0:
             self.__updatePlot()
-        self.data[self.end[0]][self.end[1]] = 3
+        return events
+
+
+
+    def __paint(self, rows, cols, color):
+        self.data[rows, cols] = color
+        if self.tracing:
+            self.events.append([rows, cols, color])
+
+
+
+    def __heurCost(self, cell):
+        # Manhattan distance, computed per cell so that an edit never touches a whole grid
+        row, col = divmod(cell, len(self.data[0]))
+        return abs(self.end[0]-row) + abs(self.end[1]-col)
+
+
+
+    def __key(self, cell):
+        cost = min(self.g[cell], self.rhs[cell])
+        return [cost + self.__heurCost(cell), cost]
+
+
+
+    def __initialize(self):
+        width = len(self.data[0])
+        start = self.start[0]*width + self.start[1]
+        self.open = (self.data == 1).ravel()
+        # lists, as the search reads and writes single cells only
+        self.g = [float("inf")]*self.data.size
+        self.rhs = [float("inf")]*self.data.size
+        self.active = []
+        self.path = []
+        self.__updateCell(start)
+
+
+
+    def __updateCell(self, cell):
+        # rhs from the neighbours, walls always keep an infinite g so they are never used
+        width = len(self.data[0])
+        if not self.open[cell]:
+            self.rhs[cell] = float("inf")
+        elif cell == self.start[0]*width + self.start[1]:
+            self.rhs[cell] = 0
+        else:
+            self.rhs[cell] = 1 + min(self.g[cell-width], self.g[cell+width], self.g[cell-1], self.g[cell+1])
+        if self.g[cell] != self.rhs[cell]:
+            heapq.heappush(self.active, self.__key(cell) + [cell])
+
+
+
+    def __explore(self):
+        width = len(self.data[0])
+        end = self.end[0]*width + self.end[1]
+        pushed = len(self.active)
+        pops, expansions, peak = 0, 0, len(self.active)
+
+        # until the goal is consistent, and no cell in the heap can shorten its path
+        while len(self.active) != 0:
+            if len(self.active) > peak:
+                peak = len(self.active)
+            key = self.active[0]
+            cell = key[2]
+            # an entry is stale once the cell is consistent, or its key has changed since
+            if self.g[cell] == self.rhs[cell] or key[:2] != self.__key(cell):
+                heapq.heappop(self.active)
+                pops += 1
+                continue
+            if key[:2] >= self.__key(end) and self.g[end] == self.rhs[end]:
+                break
+            heapq.heappop(self.active)
+            pops += 1
+            expansions += 1
+
+            # a shorter path fixes the cost, a longer one resets it and the cell is queued again
+            if self.g[cell] > self.rhs[cell]:
+                self.g[cell] = self.rhs[cell]
+            else:
+                self.g[cell] = float("inf")
+                self.__updateCell(cell)
+            for neighbour in [cell-width, cell+width, cell-1, cell+1]:
+                if self.open[neighbour]:
+                    self.__updateCell(neighbour)
+
+            if self.tracing and self.data.flat[cell] == 1:
+                self.visited.append(cell)
+                self.__paint(*divmod(cell, width), 2)
+                yield from self.__flush()
+
+        if self.stats.enabled:
+            self.stats.count("expansions", expansions)
+            self.stats.count("pushes", pops + len(self.active) - pushed)
+            self.stats.count("stalePops", pops - expansions)
+            self.stats.peak("peakFrontier", peak)
+        return self.g[end] != float("inf")
+
+
+
+    def __clearPath(self):
+        # the previous solution, except the cells closed since
+        width = len(self.data[0])
+        cells = np.array(self.path, dtype=np.int64)
+        cells = cells[self.open[cells]]
+        self.__paint(*np.divmod(cells, width), 1)
+        self.path = []
+
+
+
+    def __backTrack(self):
+        # down the costs from the goal, every step to a neighbour 1 closer to the start
+        width = len(self.data[0])
+        start = self.start[0]*width + self.start[1]
+        cell = self.end[0]*width + self.end[1]
+        self.path = [cell]
+        self.__paint(*divmod(cell, width), 3)
+        while cell != start:
+            cell = min([cell-width, cell+width, cell-1, cell+1], key=lambda neighbour: self.g[neighbour])
+            self.path.append(cell)
+            self.__paint(*divmod(cell, width), 3)
+            if self.tracing:
+                yield from self.__flush()
+
+
+
+    def __displayPathOnly(self):
+        # only the cells visited by this run, so the cost stays in the size of the repair
+        width = len(self.data[0])
+        cells = np.array(self.visited, dtype=np.int64)
+        cells = cells[self.data.flat[cells] == 2]
+        self.__paint(*np.divmod(cells, width), 1)
+        self.visited = []
+
+
+
+    def __run(self):
+        self.stats.reset()
+        self.stats.start("total")
+        self.__createPlot()
+        if self.g is None:
+            self.__initialize()
+
+        # repairs the costs changed by the edits since the latest run, or searches everything on the first one
+        self.__clearPath()
+        self.stats.start("search")
+        self.found = yield from self.__explore()
+        self.stats.stop("search")
+        if self.found:
+            self.stats.start("backtrack")
+            yield from self.__backTrack()
+            self.stats.stop("backtrack")
 
         self.__displayPathOnly()
-        
+        if self.tracing:
+            yield from self.__flush()
+
         self.__updatePlot()
-        print("end of wall follow algorithm")   
-        plt.ioff()
-        plt.show()
+        self.stats.stop("total")
+        self.__closePlot("end of lifelong planning astar algorithm")
+
+
+
+    def solve(self):
+        for event in self.__run():
+            pass
+        return self.found
+
+
+
+    def solveSteps(self):
+        # yields [rows, cols, color] for every change of self.data, self.found is set once exhausted
+        self.tracing = True
+        yield from self.__run()
+
+
+
+    def setWall(self, cell, open):
+        # opens (open=True) or closes a cell of self.data, the next run repairs the path around it
+        row, col = cell
+        height, width = self.data.shape
+        if not (0 < row < height-1 and 0 < col < width-1):
+            raise ValueError("cell %s is on the outer wall, which cannot change" % (cell,))
+        if (self.data[row, col] != 0) == open:
+            return
+        self.data[row, col] = 1 if open else 0
+        if self.g is None:
+            return
+
+        # a closed cell loses its cost at once, so its neighbours no longer go through it
+        cell = row*width + col
+        self.open[cell] = open
+        if not open:
+            self.g[cell] = float("inf")
+        for neighbour in [cell, cell-width, cell+width, cell-1, cell+1]:
+            self.__updateCell(neighbour)
+
+
+
+class MazeIndex:
+    def __init__(self, data, memoryBudget=256*2**20):
+        self.data = data # maze (2d-array), not modified
+        self.width = len(data[0])
+
+        self.fields = OrderedDict()       # distance and predecessor grids of each source, least recently used first
+        self.memoryBudget = memoryBudget  # max bytes used by all cached grids
+        self.memoryUsed = 0
+
+        self.perfect = False # whether the maze is a tree, i.e. exactly 1 path between any 2 cells
+        self.parent = None   # parent of each cell in the spanning tree, flattened, -1 for the root
+        self.depth = None    # depth of each cell in the spanning tree, flattened, -1 if not in the tree
+        self.__buildTree()
+
+
+
+    def __buildTree(self):
+        open = self.data == 1
+        if not open.any():
+            return
+        root = np.argwhere(open)[0]
+        depth, parent = breadthFirst(self.data, root)
+
+        # a connected graph is a tree when it has 1 edge less than cells
+        edges = np.count_nonzero(open[1:, :] & open[:-1, :]) + np.count_nonzero(open[:, 1:] & open[:, :-1])
+        cells = np.count_nonzero(open)
+        if np.count_nonzero(depth >= 0) == cells and edges == cells-1:
+            self.perfect = True
+            self.parent = parent.ravel()
+            self.depth = depth.ravel()
+
+
+
+    def field(self, source):
+        key = (int(source[0]), int(source[1]))
+        if key in self.fields:
+            self.fields.move_to_end(key)
+            return self.fields[key]
+
+        field = breadthFirst(self.data, source)
+        size = field[0].nbytes + field[1].nbytes
+        # drop the least recently used grids until the new one fits
+        while len(self.fields) != 0 and self.memoryUsed + size > self.memoryBudget:
+            oldest = self.fields.popitem(last=False)[1]
+            self.memoryUsed -= oldest[0].nbytes + oldest[1].nbytes
+        if size <= self.memoryBudget:
+            self.fields[key] = field
+            self.memoryUsed += size
+        return field
+
+
+
+    def __treePath(self, start, end):
+        first = start[0]*self.width + start[1]
+        last = end[0]*self.width + end[1]
+        if self.depth[first] < 0 or self.depth[last] < 0:
+            return []
+
+        # climb from both cells until they meet at the lowest common ancestor
+        head, tail = [], []
+        while self.depth[first] > self.depth[last]:
+            head.append(first)
+            first = self.parent[first]
+        while self.depth[last] > self.depth[first]:
+            tail.append(last)
+            last = self.parent[last]
+        while first != last:
+            head.append(first)
+            tail.append(last)
+            first = self.parent[first]
+            last = self.parent[last]
+        head.append(first)
+        return [list(divmod(int(cell), self.width)) for cell in head + tail[::-1]]
+
+
+
+    def path(self, start, end):
+        # all cells from the start to the end, empty if unreachable
+        if self.perfect:
+            return self.__treePath(start, end)
+
+        distance, predecessor = self.field(start)
+        if distance[end[0], end[1]] < 0:
+            return []
+        cells = []
+        cell = end[0]*self.width + end[1]
+        while cell >= 0:
+            cells.append(list(divmod(int(cell), self.width)))
+            cell = predecessor.flat[cell]
+        return cells[::-1]
+
+
+
+    def distance(self, start, end):
+        # number of steps from the start to the end, -1 if unreachable
+        if self.perfect:
+            return len(self.__treePath(start, end))-1
+        return int(self.field(start)[0][end[0], end[1]])
+
+
+
+INFINITY = np.iinfo(np.int32).max # distance of the cells not reached (yet) by OutOfCore, or by any search of HierarchicalIndex
+BATCH_CELLS = 2**22 # max (portal, chunk cell) pairs searched at once by portalDistances
+
+def portalDistances(chunks, portals):
+    # distances between the portals of each chunk, within the chunk only, -1 if unreachable
+    # chunks: paths (count x rows x cols bools) padded with walls, portals: flattened cells of each chunk
+    count, height, width = chunks.shape
+    size = height*width
+    counts = np.array([len(cells) for cells in portals], dtype=np.int64)
+    tables = np.full(np.sum(counts**2), -1, dtype=np.int32)
+    starts = np.cumsum(counts**2) - counts**2 # first entry of each table
+    if counts.sum() != 0:
+        chunkOf = np.repeat(np.arange(count), counts) # chunk of each source
+        first = np.cumsum(counts) - counts            # first source of each chunk
+        cells = np.concatenate(portals).astype(np.int64)
+        slot = np.full(count*size, -1, dtype=np.int64) # index of each portal in its chunk
+        slot[chunkOf*size + cells] = np.arange(len(cells)) - first[chunkOf]
+        open = chunks.ravel()
+        offsets = np.array([-width, width, -1, 1]) # up, down, left, right
+
+        # one breadth-first search from every portal at once, each within its own chunk
+        source = np.arange(len(cells))
+        visited = np.zeros(len(cells)*size, dtype=bool)
+        owner = np.empty(len(cells)*size, dtype=np.int32)
+        visited[source*size + cells] = True
+        depth = 0
+        while len(source) != 0:
+            chunk = chunkOf[source]
+            reached = slot[chunk*size + cells]
+            hit = reached >= 0
+            chunk, row = chunk[hit], source[hit] - first[chunk[hit]]
+            tables[starts[chunk] + row*counts[chunk] + reached[hit]] = depth
+
+            depth += 1
+            cells = (cells[:, None] + offsets).ravel()
+            source = np.repeat(source, 4)
+            keys = source*size + cells
+            keep = open[chunkOf[source]*size + cells] & ~visited[keys]
+            source, cells, keys = source[keep], cells[keep], keys[keep]
+            # a cell reached from several cells is kept only once
+            index = np.arange(len(keys), dtype=np.int32)
+            owner[keys] = index
+            keep = owner[keys] == index
+            source, cells, keys = source[keep], cells[keep], keys[keep]
+            visited[keys] = True
+    return [tables[start:start+k*k].reshape(k, k) for start, k in zip(starts, counts)]
+
+
+
+class HierarchicalIndex:
+    def __init__(self, data, chunkSize=64):
+        self.data = data # maze (2d-array), only modified by setWall
+        self.chunkSize = chunkSize              # rows and columns of cells of each chunk
+        self.rows = -(-len(data)//chunkSize)    # number of chunks down
+        self.cols = -(-len(data[0])//chunkSize) # number of chunks across
+        self.width = self.cols*chunkSize        # row length of flattened cells, the grid is extended with walls to whole chunks
+
+        self.open = np.zeros((self.rows*chunkSize, self.width), dtype=bool) # paths
+        self.open[:len(data), :len(data[0])] = data == 1
+        self.portals = [None]*(self.rows*self.cols) # flattened cells of each chunk next to a path of another chunk
+        self.tables = [None]*(self.rows*self.cols)  # distances between the portals of each chunk, within the chunk, -1 if none
+        self.graph = {} # edges of each portal, as [portal, distance], to the portals of its chunk and of the chunks next to it
+        for i in range(self.rows):
+            self.__build(i, i+1, 0, self.cols)
+
+
+
+    def __build(self, i0, i1, j0, j1):
+        # portals and tables of the chunks in rows [i0, i1) and columns [j0, j1)
+        c = self.chunkSize
+        top, bottom, left, right = i0*c, i1*c, j0*c, j1*c
+        open = self.open[top:bottom, left:right]
+        # with the cells around, walls beyond the grid
+        around = np.zeros((bottom-top+2, right-left+2), dtype=bool)
+        r0, r1 = max(top-1, 0), min(bottom+1, len(self.open))
+        c0, c1 = max(left-1, 0), min(right+1, self.width)
+        around[r0-top+1:r1-top+1, c0-left+1:c1-left+1] = self.open[r0:r1, c0:c1]
+
+        # paths with a path of the neighbouring chunk next to them
+        rows, cols = np.arange(bottom-top)%c, np.arange(right-left)%c
+        portal = open & ((around[:-2, 1:-1] & (rows == 0)[:, None]) | (around[2:, 1:-1] & (rows == c-1)[:, None]) |
+                         (around[1:-1, :-2] & (cols == 0)) | (around[1:-1, 2:] & (cols == c-1)))
+
+        # all chunks stacked, padded with walls
+        count = (i1-i0)*(j1-j0)
+        chunks = np.zeros((count, c+2, c+2), dtype=bool)
+        chunks[:, 1:-1, 1:-1] = open.reshape(i1-i0, c, j1-j0, c).swapaxes(1, 2).reshape(count, c, c)
+        chunk, row, col = np.nonzero(portal.reshape(i1-i0, c, j1-j0, c).swapaxes(1, 2).reshape(count, c, c))
+        ids = (np.arange(i0, i1)[:, None]*self.cols + np.arange(j0, j1)).ravel()
+        counts = np.bincount(chunk, minlength=count)
+        cells = ((ids[chunk]//self.cols*c + row)*self.width + ids[chunk]%self.cols*c + col)
+        splits = np.cumsum(counts)[:-1]
+        local = np.split((row+1)*(c+2) + col+1, splits)
+
+        for id, portals in zip(ids, np.split(cells, splits)):
+            if self.portals[id] is not None:
+                for portal in self.portals[id].tolist():
+                    del self.graph[portal]
+            self.portals[id] = portals
+            for portal in portals.tolist():
+                self.graph[portal] = []
+
+        # edges to the paths next to the portals in other chunks, which are portals too
+        row, col = divmod(cells, self.width)
+        for nextRow, nextCol in [[row-1, col], [row+1, col], [row, col-1], [row, col+1]]:
+            inside = (nextRow >= 0) & (nextRow < len(self.open)) & (nextCol >= 0) & (nextCol < self.width)
+            inside[inside] = self.open[nextRow[inside], nextCol[inside]]
+            inside &= (nextRow//c != row//c) | (nextCol//c != col//c)
+            for portal, neighbour in zip(cells[inside].tolist(), (nextRow*self.width + nextCol)[inside].tolist()):
+                self.graph[portal].append([neighbour, 1])
+
+        # as many chunks at once as fit in BATCH_CELLS
+        start = 0
+        while start < count:
+            stop, total = start+1, counts[start]*(c+2)**2
+            while stop < count and total + counts[stop]*(c+2)**2 <= BATCH_CELLS:
+                total += counts[stop]*(c+2)**2
+                stop += 1
+            for id, table in zip(ids[start:stop], portalDistances(chunks[start:stop], local[start:stop])):
+                self.tables[id] = table
+                portals = self.portals[id]
+                for i, j in zip(*np.nonzero(table > 0)):
+                    self.graph[int(portals[i])].append([int(portals[j]), int(table[i, j])])
+            start = stop
+
+
+
+    def __chunk(self, cell):
+        row, col = divmod(cell, self.width)
+        return row//self.chunkSize*self.cols + col//self.chunkSize
+
+
+
+    def __field(self, cell, target=None):
+        # distances and predecessors from a cell within its chunk (padded with walls), and the position of the chunk
+        c = self.chunkSize
+        chunk = self.__chunk(cell)
+        top, left = chunk//self.cols*c, chunk%self.cols*c
+        padded = np.zeros((c+2, c+2), dtype=bool)
+        padded[1:-1, 1:-1] = self.open[top:top+c, left:left+c]
+        row, col = divmod(cell, self.width)
+        if target is not None:
+            target = [target//self.width-top+1, target%self.width-left+1]
+        distance, predecessor = breadthFirst(padded, [row-top+1, col-left+1], target)
+        return distance, predecessor, top, left
+
+
+
+    def __local(self, cell, top, left):
+        # flattened cell of a padded chunk
+        row, col = divmod(cell, self.width)
+        return (row-top+1)*(self.chunkSize+2) + col-left+1
+
+
+
+    def __search(self, start, end):
+        # A* over the portals, from the start and to the end through their own chunks,
+        # returns the distance (-1 if unreachable) and all portals crossed, as [start, portals..., end]
+        first, last = self.__chunk(start), self.__chunk(end)
+        startField, endField = self.__field(start), self.__field(end)
+        endRow, endCol = divmod(end, self.width)
+        START, GOAL = -2, -1 # nodes of the start and the end
+
+        cost = {}   # shortest distance found from the start to each node
+        parent = {} # previous node on that path
+        heap = []   # nodes to expand, as [cost + predicted cost, cost, node]
+        candidates = [] # nodes reached by the latest node expanded, as [node, cost, previous node]
+        distance = startField[0].ravel()
+        for portal in self.portals[first].tolist():
+            d = int(distance[self.__local(portal, *startField[2:])])
+            if d >= 0:
+                candidates.append([portal, d, START])
+        if first == last and distance[self.__local(end, *startField[2:])] >= 0:
+            candidates.append([GOAL, int(distance[self.__local(end, *startField[2:])]), START])
+        # distance to the end of the portals of its chunk
+        toEnd = {}
+        distance = endField[0].ravel()
+        for portal in self.portals[last].tolist():
+            d = int(distance[self.__local(portal, *endField[2:])])
+            if d >= 0:
+                toEnd[portal] = d
+
+        while True:
+            for node, d, previous in candidates:
+                if d < cost.get(node, INFINITY):
+                    cost[node], parent[node] = d, previous
+                    row, col = divmod(node, self.width) if node != GOAL else (endRow, endCol)
+                    heapq.heappush(heap, [d + abs(row-endRow) + abs(col-endCol), d, node])
+            candidates = []
+            if len(heap) == 0:
+                return -1, []
+            d, node = heapq.heappop(heap)[1:]
+            if d > cost[node]:
+                continue
+            if node == GOAL:
+                break
+
+            for neighbour, weight in self.graph[node]:
+                candidates.append([neighbour, d + weight, node])
+            if node in toEnd:
+                candidates.append([GOAL, d + toEnd[node], node])
+
+        nodes = [GOAL]
+        while nodes[-1] != START:
+            nodes.append(parent[nodes[-1]])
+        nodes = [start if node == START else end if node == GOAL else node for node in nodes[::-1]]
+        return int(d), nodes
+
+
+
+    def __refine(self, start, end):
+        # all flattened cells from the start to the end of the same chunk, through that chunk only
+        distance, predecessor, top, left = self.__field(start, end)
+        cells = []
+        cell = self.__local(end, top, left)
+        while cell >= 0:
+            row, col = divmod(int(cell), self.chunkSize+2)
+            cells.append((row+top-1)*self.width + col+left-1)
+            cell = predecessor.flat[cell]
+        return cells[::-1]
+
+
+
+    def path(self, start, end):
+        # all cells from the start to the end, empty if unreachable
+        distance, nodes = self.__search(start[0]*self.width + start[1], end[0]*self.width + end[1])
+        if distance < 0:
+            return []
+        # only the chunks the path goes through are searched again, for the cells between their portals
+        cells = nodes[:1]
+        for first, last in zip(nodes[:-1], nodes[1:]):
+            if self.__chunk(first) != self.__chunk(last):
+                cells.append(last)
+            else:
+                cells += self.__refine(first, last)[1:]
+        return [list(divmod(int(cell), self.width)) for cell in cells]
+
+
+
+    def distance(self, start, end):
+        # number of steps from the start to the end, -1 if unreachable
+        return self.__search(start[0]*self.width + start[1], end[0]*self.width + end[1])[0]
+
+
+
+    def setWall(self, cell, open):
+        # opens (open=True) or closes a cell, only its chunk and the chunks it borders are rebuilt
+        row, col = cell
+        self.data[row, col] = 1 if open else 0
+        self.open[row, col] = open
+        c = self.chunkSize
+        i, j = row//c, col//c
+        i0 = i-1 if row%c == 0 and i > 0 else i
+        i1 = i+2 if row%c == c-1 and i+1 < self.rows else i+1
+        j0 = j-1 if col%c == 0 and j > 0 else j
+        j1 = j+2 if col%c == c-1 and j+1 < self.cols else j+1
+        self.__build(i0, i1, j0, j1)
+
+
+
+def readRows(array, start, stop):
+    # copy of the rows [start, stop) of a 2d-array, a memmap is mapped for these rows only,
+    # so its pages are released as soon as the copy is made
+    if not isinstance(array, np.memmap) or array.filename is None:
+        return np.array(array[start:stop])
+    rows = np.memmap(array.filename, dtype=array.dtype, mode="r", shape=(stop-start, array.shape[1]),
+                     offset=array.offset + start*array.strides[0])
+    copy = np.array(rows)
+    del rows
+    return copy
+
+
+
+def writeRows(array, start, values):
+    # values written to the rows from start onwards of a 2d-array, mapped for these rows only
+    if not isinstance(array, np.memmap) or array.filename is None:
+        array[start:start+len(values)] = values
+        return
+    rows = np.memmap(array.filename, dtype=array.dtype, mode="r+", shape=values.shape,
+                     offset=array.offset + start*array.strides[0])
+    rows[:] = values
+    del rows
+
+
+
+class OutOfCore:
+    def __init__(self, data, output, packed=False, memoryBudget=256*2**20, scratch=None, stats=False):
+        self.data = data     # maze (2d-array) of uint8, usually a memmap of the whole file (np.memmap or np.load(..., mmap_mode="r")), not modified
+        self.packed = packed # whether each row of data is bit-packed with np.packbits, 1 for paths
+        self.width = len(data)                # columns of the maze, which is square also when its rows are packed
+        self.start = [1, 1]                   # starting point of the maze
+        self.end = [len(data)-2, len(data)-2] # goal of the maze
+
+        self.output = output   # .npy file written with the solution mask, in the same format as data (1 on the path)
+        self.scratch = scratch # directory of the temporary distance file, the system default if None
+        self.memoryBudget = memoryBudget # max bytes of the rows held in memory at once
+        # rows of a band, each row needs its paths, distances (int32) and solution mask, and the frontiers on top
+        self.bandRows = max(1, memoryBudget//(16*self.width) - 2)
+
+        self.solution = None # memmap of the output file, once solved
+        self.length = -1     # number of steps on the path, as solveBatch and MazeIndex.distance, -1 if unreachable
+        self.found = False   # whether the goal is reached
+        self.bandUpdates = 0 # number of bands processed until the distances stop changing
+        self.stats = Stats(stats) # counters and timers of the latest run, when enabled
+
+
+
+    def __loadOpen(self, start, stop):
+        # bool paths of the rows [start, stop), with a wall row above and below
+        rows = readRows(self.data, start, stop)
+        if self.packed:
+            rows = np.unpackbits(rows, axis=1, count=self.width)
+        open = np.zeros((stop-start+2, self.width), dtype=bool)
+        open[1:-1] = rows == 1
+        return open.ravel()
+
+
+
+    def __relax(self, open, distance, seeds):
+        # shortest distances within a band, as waves from the seeds, which may start at different distances;
+        # a cell is updated again whenever a wave brings it closer to the start
+        offsets = np.array([-self.width, self.width, -1, 1]) # up, down, left, right
+        owner = np.empty(distance.size, dtype=np.int32)
+        frontier = seeds[distance[seeds] < INFINITY]
+        waves = 0
+        while len(frontier) != 0:
+            waves += 1
+            neighbours = (frontier[:, None] + offsets).ravel()
+            candidates = np.repeat(distance[frontier] + 1, 4)
+            closer = open[neighbours] & (candidates < distance[neighbours])
+            neighbours, candidates = neighbours[closer], candidates[closer]
+            np.minimum.at(distance, neighbours, candidates)
+            # a cell reached from several cells is kept only once
+            index = np.arange(len(neighbours), dtype=np.int32)
+            owner[neighbours] = index
+            frontier = neighbours[owner[neighbours] == index]
+        self.stats.count("waves", waves)
+
+
+
+    def __sweep(self, distances):
+        # process the bands that have changed, going down then up, until no band changes
+        height = len(self.data)
+        bands = -(-height//self.bandRows)
+        changed = np.zeros(bands, dtype=bool)
+        changed[self.start[0]//self.bandRows] = True
+        order = list(range(bands)) + list(range(bands-1, -1, -1))
+        while changed.any():
+            for band in order:
+                if not changed[band]:
+                    continue
+                changed[band] = False
+                self.bandUpdates += 1
+                self.stats.count("bandUpdates")
+
+                # the band, with the last row of the band above and the first row of the band below
+                first, last = band*self.bandRows, min(height, (band+1)*self.bandRows)
+                top, bottom = max(0, first-1), min(height, last+1)
+                open = self.__loadOpen(top, bottom)
+                distance = np.full(open.size, INFINITY, dtype=np.int32)
+                distance[self.width:-self.width] = readRows(distances, top, bottom).ravel()
+                edges = distance[self.width:2*self.width].copy(), distance[-2*self.width:-self.width].copy()
+
+                # distances are consistent inside the band, except near rows changed by the neighbouring bands
+                rows = np.array([1, 2, bottom-top-1, bottom-top])
+                seeds = (rows[:, None]*self.width + np.arange(self.width)).ravel()
+                if top <= self.start[0] < bottom:
+                    seeds = np.append(seeds, (self.start[0]-top+1)*self.width + self.start[1])
+                self.__relax(open, distance, seeds)
+
+                distance = distance.reshape(-1, self.width)[1:-1]
+                writeRows(distances, top, distance)
+                # the rows shared with the neighbouring bands
+                if first != 0 and (distance[0] != edges[0]).any():
+                    changed[band-1] = True
+                if last != height and (distance[-1] != edges[1]).any():
+                    changed[band+1] = True
+
+
+
+    def __backTrack(self, distances):
+        # walks from the goal down the distances, 1 band at a time
+        height = len(self.data)
+        width = self.width
+        row, col = self.end
+        remaining = int(readRows(distances, row, row+1)[0, col])
+        while True:
+            band = row//self.bandRows
+            first, last = band*self.bandRows, min(height, (band+1)*self.bandRows)
+            top, bottom = max(0, first-1), min(height, last+1)
+            distance = readRows(distances, top, bottom)
+            mask = readRows(self.solution, top, bottom)
+            if self.packed:
+                mask = np.unpackbits(mask, axis=1, count=width)
+
+            while True:
+                mask[row-top, col] = 1
+                if remaining == 0 or not first <= row < last:
+                    break
+                remaining -= 1
+                # the first neighbour 1 step closer to the start, the halo rows included
+                for nextRow, nextCol in [[row-1, col], [row+1, col], [row, col-1], [row, col+1]]:
+                    if top <= nextRow < bottom and distance[nextRow-top, nextCol] == remaining:
+                        row, col = nextRow, nextCol
+                        break
+
+            writeRows(self.solution, top, np.packbits(mask, axis=1) if self.packed else mask)
+            if remaining == 0:
+                break
+
+
+
+    def solve(self):
+        self.stats.reset()
+        self.stats.start("total")
+        height = len(self.data)
+        shape = self.data.shape
+        self.solution = np.lib.format.open_memmap(self.output, mode="w+", dtype=np.uint8, shape=shape)
+
+        folder = tempfile.mkdtemp(dir=self.scratch)
+        try:
+            # distance of each cell from the start, INFINITY if not reached (yet)
+            distances = np.lib.format.open_memmap(os.path.join(folder, "distance.npy"), mode="w+",
+                                                  dtype=np.int32, shape=(height, self.width))
+            for start in range(0, height, self.bandRows):
+                stop = min(height, start+self.bandRows)
+                writeRows(distances, start, np.full((stop-start, self.width), INFINITY, dtype=np.int32))
+            if self.__loadOpen(self.start[0], self.start[0]+1)[self.width + self.start[1]]:
+                row = readRows(distances, self.start[0], self.start[0]+1)
+                row[0, self.start[1]] = 0
+                writeRows(distances, self.start[0], row)
+
+            self.stats.start("sweep")
+            self.__sweep(distances)
+            self.stats.stop("sweep")
+
+            length = int(readRows(distances, self.end[0], self.end[0]+1)[0, self.end[1]])
+            self.found = length != INFINITY
+            if self.found:
+                self.length = length
+                self.stats.start("backtrack")
+                self.__backTrack(distances)
+                self.stats.stop("backtrack")
+            del distances
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+        self.solution = np.load(self.output, mmap_mode="r")
+        self.stats.stop("total")
+        return self.found
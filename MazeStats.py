@@ -0,0 +1,92 @@
+import time
+
+class Stats:
+    def __init__(self, enabled=False):
+        self.enabled = enabled # disabled stats ignore every call, so a run only pays for a few method calls
+        self.counters = {} # name: events counted in the latest run
+        self.timers = {}   # name: seconds spent in the latest run, by a monotonic clock
+        self.started = {}  # name: start time of each running timer
+
+
+
+    def reset(self):
+        self.counters = {}
+        self.timers = {}
+        self.started = {}
+
+
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + int(amount)
+
+
+
+    def peak(self, name, value):
+        # largest value seen, e.g. the size of a frontier
+        if self.enabled:
+            self.counters[name] = max(self.counters.get(name, 0), int(value))
+
+
+
+    def start(self, name):
+        if self.enabled:
+            self.started[name] = time.perf_counter()
+
+
+
+    def stop(self, name):
+        # the time since start is added to the timer, so a timer can run several times
+        # steps consumed from generateSteps() or solveSteps() include the time of the consumer
+        if self.enabled and name in self.started:
+            elapsed = time.perf_counter() - self.started.pop(name)
+            self.timers[name] = self.timers.get(name, 0.0) + elapsed
+
+
+
+    def watch(self, observer):
+        # the observer, whose plotting time is recorded as the timer "plot"
+        if not self.enabled or observer is None:
+            return observer
+        return TimedObserver(observer, self)
+
+
+
+    def asDict(self):
+        return {"counters": dict(self.counters), "timers": dict(self.timers)}
+
+
+
+class TimedObserver:
+    def __init__(self, observer, stats):
+        self.observer = observer # the visualizer wrapped
+        self.stats = stats
+
+
+
+    def start(self, data, colors):
+        self.stats.start("plot")
+        self.observer.start(data, colors)
+        self.stats.stop("plot")
+
+
+
+    def update(self, data, force=False):
+        # force is only passed when set, observers may take the data alone
+        self.stats.start("plot")
+        if force:
+            self.observer.update(data, force=True)
+        else:
+            self.observer.update(data)
+        self.stats.stop("plot")
+
+
+
+    def finish(self, data, message=None):
+        # not timed, it waits for the plot to be closed
+        self.observer.finish(data, message)
+
+
+
+    def __getattr__(self, name):
+        return getattr(self.observer, name)
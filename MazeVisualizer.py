@@ -0,0 +1,63 @@
+import matplotlib
+import matplotlib.pyplot as plt
+import time
+
+class Visualizer:
+    def __init__(self, fps=30, pause=0.001):
+        self.fps = fps       # max number of frames drawn per second, None draws every update
+        self.pause = pause   # delay between plot updates
+        self.lastDraw = None # time of the latest frame drawn
+
+        self.figure = None
+        self.axis = None
+        self.mazeImage = None
+
+
+
+    def start(self, data, colors):
+        plt.ion()
+        self.figure = plt.figure()
+
+        bounds = [colors.index(x) for x in colors]
+        cmap = matplotlib.colors.ListedColormap(colors)
+        norm = matplotlib.colors.BoundaryNorm(bounds, cmap.N-1)
+
+        self.axis = self.figure.add_subplot()
+        self.axis.set_xticks(ticks=[])
+        self.axis.set_yticks(ticks=[])
+        self.mazeImage = self.axis.imshow(data, cmap=cmap, norm=norm)
+        self.lastDraw = None
+
+
+
+    def update(self, data, force=False):
+        now = time.monotonic()
+        # skip frames requested faster than the frame rate
+        if not force and self.fps and self.lastDraw is not None and now - self.lastDraw < 1/self.fps:
+            return
+        self.lastDraw = now
+
+        self.mazeImage.set_data(data)
+        self.figure.canvas.draw()
+        plt.pause(self.pause)
+        self.figure.canvas.flush_events()
+
+
+
+    def annotate(self, cell, text):
+        self.axis.text(cell[1], cell[0], text, ha='center', va='center')
+
+
+
+    def clearAnnotations(self):
+        for text in self.axis.texts:
+            text.set_visible(False)
+
+
+
+    def finish(self, data, message=None):
+        self.update(data, force=True)
+        if message is not None:
+            print(message)
+        plt.ioff()
+        plt.show()
@@ -1,8 +1,9 @@
 import MazeGenerator as gen
 import MazeSolver as sol
+import MazeVisualizer as vis
 
-maze = gen.Wilson(20) # maze size is required
+maze = gen.Wilson(20, observer=vis.Visualizer()) # maze size is required
 data = maze.generate()
 
-solver = sol.DeadEndFill(data) # maze (2d-array) is required
+solver = sol.DeadEndFill(data, observer=vis.Visualizer()) # maze (2d-array) is required
 solver.solve()
\ No newline at end of file